@@ -0,0 +1,57 @@
+'''
+Memory of million element numeric fields stored as list of python objects vs `array.array`.
+
+Run: PYTHONPATH=. python benchmarks/bench_array_memory.py
+'''
+import json
+import time
+import tracemalloc
+import typing
+
+from datamodels import array_field, datamodel
+
+N = 1_000_000
+
+
+@datamodel
+class AsLists:
+    ints: typing.List[int]
+    floats: typing.List[float]
+
+
+@datamodel
+class AsArrays:
+    ints: typing.List[int] = array_field()
+    floats: typing.List[float] = array_field()
+
+
+def measure(cls, json_str):
+    # parse inside the traced block so the retained size contains only the objects owned by the model
+    tracemalloc.start()
+    d = json.loads(json_str)
+    start = time.perf_counter()
+    obj = cls.from_dict(d)
+    from_dict_s = time.perf_counter() - start
+    del d
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    obj.to_serializeable()
+    to_serializeable_s = time.perf_counter() - start
+    return obj, size, peak, from_dict_s, to_serializeable_s
+
+
+def main():
+    json_str = json.dumps({'ints': list(range(N)), 'floats': [i * 0.5 for i in range(N)]})
+    print(f'{N} element int and float fields')
+    print(f'{"":<10}{"retained MiB":>14}{"peak MiB":>10}{"from_dict s":>13}{"to_ser s":>10}')
+    for cls in (AsLists, AsArrays):
+        obj, size, peak, from_dict_s, to_serializeable_s = measure(cls, json_str)
+        print(f'{cls.__name__:<10}{size / 2**20:>14.1f}{peak / 2**20:>10.1f}'
+              f'{from_dict_s:>13.3f}{to_serializeable_s:>10.3f}')
+        del obj
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+'''
+Point and range queries of indexed `ModelCollection` vs linear scans over list of models.
+
+Run: PYTHONPATH=. python benchmarks/bench_collection.py
+'''
+import random
+import time
+import timeit
+
+from datamodels import ModelCollection, datamodel, field
+
+N = 200_000
+QUERIES = 100
+
+
+@datamodel(frozen=True)
+class Event:
+    id: int = field(metadata={'index': 'hash'})
+    user: str = field(default='', metadata={'index': 'hash'})
+    timestamp: float = field(default=0.0, metadata={'index': 'sorted'})
+
+
+def main():
+    rnd = random.Random(0)
+    dicts = [{'id': i, 'user': f'user {rnd.randrange(1000)}', 'timestamp': rnd.random() * 1e6} for i in range(N)]
+
+    start = time.perf_counter()
+    events = [Event.from_dict(d) for d in dicts]
+    print(f'from_dict of {N} events: {time.perf_counter() - start:.2f} s')
+    start = time.perf_counter()
+    collection = ModelCollection.from_dicts(Event, dicts)
+    print(f'ModelCollection.from_dicts of {N} events: {time.perf_counter() - start:.2f} s')
+
+    ids = [rnd.randrange(N) for _ in range(QUERIES)]
+    users = [f'user {rnd.randrange(1000)}' for _ in range(QUERIES)]
+    starts = [rnd.random() * 1e6 for _ in range(QUERIES)]
+    cases = {
+        'get by id': (
+            lambda: [[e for e in events if e.id == i] for i in ids],
+            lambda: [collection.get('id', i) for i in ids],
+        ),
+        'get by user': (
+            lambda: [[e for e in events if e.user == u] for u in users],
+            lambda: [collection.get('user', u) for u in users],
+        ),
+        'timestamp range': (
+            lambda: [sorted((e for e in events if s <= e.timestamp < s + 1000), key=lambda e: e.timestamp)
+                     for s in starts],
+            lambda: [collection.range('timestamp', s, s + 1000) for s in starts],
+        ),
+    }
+    print(f'{QUERIES} queries')
+    print(f'  {"":<16}{"scan s":>10}{"index s":>10}')
+    for name, (scan, indexed) in cases.items():
+        assert [set(r) for r in scan()] == [set(r) for r in indexed()]
+        scan_s = timeit.timeit(scan, number=1)
+        index_s = timeit.timeit(indexed, number=1)
+        print(f'  {name:<16}{scan_s:>10.4f}{index_s:>10.6f}')
+
+    to_update = list(collection)[:1000]
+    start = time.perf_counter()
+    for e in to_update:
+        collection.remove(e)
+    for e in to_update:
+        collection.add(e)
+    print(f'remove and add 1000 events: {time.perf_counter() - start:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+'''
+Copying nested models: generic `copy.deepcopy` of plain dataclasses, `to_serializeable`/`from_dict` round trip
+and the generated `clone` (which is also what `copy.deepcopy` of a datamodel calls).
+
+Run: PYTHONPATH=. python benchmarks/bench_copy.py
+'''
+import copy
+import datetime
+import timeit
+import typing
+from dataclasses import dataclass
+
+from datamodels import datamodel
+
+
+@datamodel(frozen=True)
+class Tag:
+    name: str
+    created: datetime.datetime
+
+
+@datamodel
+class Item:
+    id: int
+    name: str
+    price: float
+    tags: typing.List[Tag]
+    attributes: typing.Dict[str, str]
+
+
+@datamodel
+class Order:
+    id: int
+    created: datetime.datetime
+    items: typing.List[Item]
+    notes: typing.Optional[str] = None
+
+
+# same as above, but plain dataclasses for the generic copy.deepcopy
+PlainTag = dataclass(frozen=True)(type('PlainTag', (), {'__annotations__': dict(Tag.__annotations__)}))
+PlainItem = dataclass(type('PlainItem', (), {'__annotations__': dict(Item.__annotations__)}))
+PlainOrder = dataclass(type('PlainOrder', (), {'__annotations__': dict(Order.__annotations__), 'notes': None}))
+
+
+def make_order(n_items, order_cls=Order, item_cls=Item, tag_cls=Tag):
+    now = datetime.datetime.now()
+    return order_cls(1, now, [
+        item_cls(i, f'item {i}', i * 1.5, [tag_cls('a', now), tag_cls('b', now)], {'color': 'red', 'size': 'L'})
+        for i in range(n_items)
+    ])
+
+
+def main():
+    for n_items in (1, 10, 100):
+        order = make_order(n_items)
+        plain_order = make_order(n_items, PlainOrder, PlainItem, PlainTag)
+        number = max(10, 10000 // n_items)
+        results = {
+            'copy.deepcopy': lambda: copy.deepcopy(plain_order),
+            'round trip': lambda: Order.from_dict(order.to_serializeable()),
+            'clone': lambda: order.clone(),
+        }
+        print(f'Order with {n_items} items, {number} copies')
+        for name, fn in results.items():
+            print(f'  {name:<14}{min(timeit.repeat(fn, number=number, repeat=3)):.4f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''
+Pickle size and speed of datamodels with the default pickling vs `compact_pickle=True`.
+
+Run: PYTHONPATH=. python benchmarks/bench_pickle.py
+'''
+import datetime
+import pickle
+import timeit
+import typing
+
+from datamodels import datamodel
+
+
+@datamodel
+class DefaultItem:
+    id: int
+    name: str
+    price: float
+    created: datetime.datetime
+
+
+@datamodel
+class DefaultOrder:
+    id: int
+    customer_name: str
+    items: typing.List[DefaultItem]
+
+
+@datamodel(compact_pickle=True)
+class CompactItem:
+    id: int
+    name: str
+    price: float
+    created: datetime.datetime
+
+
+@datamodel(compact_pickle=True)
+class CompactOrder:
+    id: int
+    customer_name: str
+    items: typing.List[CompactItem]
+
+
+def make_order(order_cls, item_cls, n_items):
+    now = datetime.datetime.now()
+    return order_cls(1, 'customer', [item_cls(i, f'item {i}', i * 1.5, now) for i in range(n_items)])
+
+
+def main():
+    protocol = pickle.HIGHEST_PROTOCOL
+    for n_items in (1, 100, 10000):
+        number = max(5, 20000 // n_items)
+        print(f'Order with {n_items} items, pickle protocol {protocol}')
+        print(f'  {"":<9}{"bytes":>10}{"dumps s":>10}{"loads s":>10}')
+        for name, order_cls, item_cls in (('default', DefaultOrder, DefaultItem),
+                                          ('compact', CompactOrder, CompactItem)):
+            order = make_order(order_cls, item_cls, n_items)
+            data = pickle.dumps(order, protocol)
+            dumps_s = min(timeit.repeat(lambda: pickle.dumps(order, protocol), number=number, repeat=3))
+            loads_s = min(timeit.repeat(lambda: pickle.loads(data), number=number, repeat=3))
+            print(f'  {name:<9}{len(data):>10}{dumps_s:>10.4f}{loads_s:>10.4f}')
+
+
+if __name__ == '__main__':
+    main()
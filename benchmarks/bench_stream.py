@@ -0,0 +1,63 @@
+'''
+Peak memory and time of writing one large datamodel as JSON with `to_json` vs streaming `dump_json`.
+
+Run: PYTHONPATH=. python benchmarks/bench_stream.py
+'''
+import time
+import tracemalloc
+import typing
+
+from datamodels import datamodel
+
+N = 1_000_000
+
+
+@datamodel
+class Item:
+    id: int
+    name: str
+    values: typing.List[float]
+
+
+@datamodel
+class Document:
+    name: str
+    items: typing.List[Item]
+
+
+class NullWriter:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, s):
+        self.size += len(s)
+
+
+def write_to_json(doc, fp):
+    fp.write(doc.to_json())
+
+
+def write_dump_json(doc, fp):
+    doc.dump_json(fp)
+
+
+def main():
+    doc = Document('doc', [Item(i, f'item {i}', [i * 0.5, i * 1.5]) for i in range(N)])
+    print(f'Document with {N} items')
+    print(f'  {"":<10}{"peak MiB":>10}{"time s":>8}{"MiB written":>13}')
+    for name, write in (('to_json', write_to_json), ('dump_json', write_dump_json)):
+        # timing without tracemalloc as it slows down allocations a lot
+        fp = NullWriter()
+        start = time.perf_counter()
+        write(doc, fp)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        write(doc, NullWriter())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'  {name:<10}{peak / 2**20:>10.1f}{elapsed:>8.2f}{fp.size / 2**20:>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
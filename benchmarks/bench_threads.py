@@ -0,0 +1,64 @@
+'''
+Scaling of `bulk_from_dicts` / `bulk_to_serializeable` with the number of worker threads on the running interpreter,
+prints whether the GIL is enabled.
+
+Run: PYTHONPATH=. python benchmarks/bench_threads.py
+'''
+import datetime
+import os
+import sys
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from datamodels import bulk_from_dicts, bulk_to_serializeable, datamodel
+
+N = 200_000
+
+
+@datamodel
+class Line:
+    sku: str
+    quantity: int
+    price: float
+
+
+@datamodel
+class Order:
+    id: int
+    customer: str
+    created: datetime.datetime
+    lines: typing.List[Line]
+    tags: typing.List[str]
+
+
+def make_dicts(n):
+    created = datetime.datetime(2020, 1, 1).isoformat()
+    return [{'id': i, 'customer': f'customer {i % 1000}', 'created': created,
+             'lines': [{'sku': f'sku {j}', 'quantity': j, 'price': j * 1.5} for j in range(3)],
+             'tags': ['a', 'b']} for i in range(n)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'python {sys.version.split()[0]}, GIL enabled: {is_gil_enabled}, {os.cpu_count()} CPUs, {N} orders')
+    dicts = make_dicts(N)
+    print(f'{"workers":<10}{"from_dicts s":>14}{"speedup":>9}{"to_ser s":>10}{"speedup":>9}')
+    base = None
+    for workers in (1, 2, 4, 8):
+        with ThreadPoolExecutor(workers) as pool:
+            objs, from_s = timed(lambda: bulk_from_dicts(Order, dicts, executor=pool))
+            _, to_s = timed(lambda: bulk_to_serializeable(objs, executor=pool))
+        if base is None:
+            base = (from_s, to_s)
+        print(f'{workers:<10}{from_s:>14.3f}{base[0] / from_s:>9.2f}{to_s:>10.3f}{base[1] / to_s:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
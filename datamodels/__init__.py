@@ -1,6 +1,10 @@
+import array
 import copy
+import copyreg
 import json
 import datetime
+import linecache
+import threading
 import typing
 from functools import partial
 from typing import Callable, Dict, Any, TypeVar, Type, Union
@@ -21,7 +25,6 @@ from dataclasses import (
     is_dataclass,
     _is_dataclass_instance,
     _set_new_attribute,
-    _create_fn,
     _MISSING_TYPE,
     __all__ as dataclass_all
 )
@@ -29,7 +32,13 @@ from datamodels import utils
 
 
 __all__ = dataclass_all + [
+    'array_field',
+    'bulk_from_dicts',
+    'bulk_to_serializeable',
     'datamodel',
+    'field_timings',
+    'memory_report',
+    'ModelCollection',
     'structure_hook',
     'unstructure_hook'
 ]
@@ -44,6 +53,13 @@ ISO8601str = str
 _json_encoder = json.JSONEncoder
 _structure_hooks = {}
 _unstructure_hooks = {}
+# guards the hook registries and the code generation of the datamodels, so those can be defined from multiple threads
+_registry_lock = threading.RLock()
+_serialized_cache_attr = '_datamodel_serialized'
+_json_cache_attr = '_datamodel_json'
+_default_inline_max_size = 1000
+_default_chunk_size = 64 * 1024
+_json_slice_size = 1024
 
 
 def is_datamodel(obj):
@@ -52,12 +68,14 @@ def is_datamodel(obj):
 
 def _register_structure_hook(type_name_str, decoder):
     global _structure_hooks
-    _structure_hooks[type_name_str] = decoder
+    with _registry_lock:
+        _structure_hooks[type_name_str] = decoder
 
 
 def _register_unstructure_hook(type_name_str, decoder):
     global _unstructure_hooks
-    _unstructure_hooks[type_name_str] = decoder
+    with _registry_lock:
+        _unstructure_hooks[type_name_str] = decoder
 
 
 def structure_hook(type_name_str: str):
@@ -91,6 +109,11 @@ def _byte_decode(v):
     return v.decode('utf-8')
 
 
+@unstructure_hook('array')
+def _array_to_list(v):
+    return v.tolist()
+
+
 @structure_hook('datetime')
 def _structure_datetime(v: Union[datetime.datetime, str]) -> datetime.datetime:
     if isinstance(v, datetime.datetime):
@@ -121,6 +144,83 @@ def _structure_bytes(v):
         return bytes(v)
 
 
+# code building
+_VALUE = '__datamodels_value__'  # placeholder for the value expression while composing expressions
+
+
+_generated_filenames = {}  # filename -> number of functions generated with it
+
+
+def _generated_filename(cls, name: str) -> str:
+    # stable filename per model and method, redefinitions of the same model get numbered
+    filename = f'<datamodels {cls.__module__}.{cls.__qualname__}.{name}>'
+    with _registry_lock:
+        n = _generated_filenames.get(filename, 0) + 1
+        _generated_filenames[filename] = n
+    return filename if n == 1 else f'{filename[:-1]}#{n}>'
+
+
+def _rename_code(code, qualname: str, line_fields: Dict[int, str]):
+    # the comprehensions and lambdas of the field expressions get the field to their names
+    if not hasattr(code, 'replace'):  # python < 3.8
+        return code
+    consts = []
+    for const in code.co_consts:
+        field_name = line_fields.get(getattr(const, 'co_firstlineno', None))
+        if field_name:
+            names = dict(co_name=f'{field_name}.{const.co_name}')
+            if hasattr(const, 'co_qualname'):
+                names.update(co_qualname=f'{qualname}.{field_name}.{const.co_name}')
+            const = const.replace(**names)
+        consts.append(const)
+    code = code.replace(co_consts=tuple(consts))
+    if hasattr(code, 'co_qualname'):
+        code = code.replace(co_qualname=qualname)
+    return code
+
+
+def _create_fn(name: str, args, body, *, globals, cls, field_lines: Dict[int, str] = {}):
+    # like dataclasses._create_fn but keeps the generated source around
+    # and registers it to linecache, so tracebacks and profilers show the model, method and the generated lines.
+    # field_lines maps body line indexes to field names
+    lines = []
+    line_fields = {}
+    for i, b in enumerate(body):
+        if i in field_lines:
+            line_fields[len(lines) + 2] = field_lines[i]  # line numbers start from 1 and the def line is first
+        lines.extend(b.rstrip('\n').split('\n'))
+    src = f'def {name}({", ".join(args)}):\n' + ''.join(f'  {line}\n' for line in lines)
+    filename = _generated_filename(cls, name)
+    linecache.cache[filename] = (len(src), None, src.splitlines(True), filename)
+    ns = {}
+    exec(compile(src, filename, 'exec'), globals, ns)
+    fn = ns[name]
+    fn.__qualname__ = f'{cls.__qualname__}.{name}'
+    fn.__code__ = _rename_code(fn.__code__, fn.__qualname__, line_fields)
+    fn.__datamodel_source__ = src
+    return fn
+
+
+def _generated_source(fn):
+    return getattr(getattr(fn, '__func__', fn), '__datamodel_source__', None)
+
+
+def _has_generated(cls, name: str) -> bool:
+    return _generated_source(getattr(cls, name, None)) is not None
+
+
+def _to_template(expr: str) -> str:
+    # turns expression with the _VALUE placeholder into expression template that can be called with .format
+    return utils.escape_braces(expr).replace(_VALUE, '{0}')
+
+
+def _embed(expr_template, value: str = '') -> str:
+    # formats expression template to be part of an other expression template:
+    # literal braces need to be escaped for the .format call of the outer template
+    # and the value expression becomes '{0}' + value
+    return _to_template(expr_template.format(_VALUE + value))
+
+
 # strcutring
 def _structure_value(t: Type[T], v: Any) -> T:
     type_str = utils.type_to_str(t)
@@ -155,10 +255,17 @@ def _structure_value(t: Type[T], v: Any) -> T:
 def _structure_dataclass(t: Type[T], v: Dict[str, Any]) -> T:
     initkw = {}
     field_and_types = typing.get_type_hints(t)
-    field_names = set(f.name for f in fields(t))  # just in case
+    field_metadatas = {f.name: f.metadata for f in fields(t)}  # just in case
     for field_name, field_type in field_and_types.items():
-        if field_name in field_names and field_name in v:
-            initkw[field_name] = _structure_value(field_type, v[field_name])
+        if field_name in field_metadatas and field_name in v:
+            hook = field_metadatas[field_name].get('structure_hook')
+            if hook:
+                initkw[field_name] = hook(v[field_name])
+            elif 'array' in field_metadatas[field_name]:
+                typecode = _array_typecode(field_type, field_metadatas[field_name]['array'])
+                initkw[field_name] = array.array(typecode, v[field_name])
+            else:
+                initkw[field_name] = _structure_value(field_type, v[field_name])
 
     return t(**initkw)
 
@@ -181,9 +288,12 @@ def _is_convert_with_type_str_structure_type(type_str):
     return type_str in {'str', 'int', 'float', 'complex', 'bool'}
 
 
-def _gen_structure_expression(t: Type[T], globs) -> str:
+def _gen_structure_expression(t: Type[T], globs, inline_depth: int = 0,
+                              inline_max_size: int = _default_inline_max_size) -> str:
     # retrurns str with '{}' so that callers can call
     # return_str.format(<value expression>)
+    # with inline_depth > 0 the from_dict of nested datamodels is inlined instead of called
+    inline = dict(inline_depth=inline_depth, inline_max_size=inline_max_size)
     type_str = utils.type_to_str(t)
     if _structure_hooks.get(type_str):
         globs[f'structure_{type_str}'] = _structure_hooks.get(type_str)  # nasty mutation, shame on me
@@ -194,31 +304,35 @@ def _gen_structure_expression(t: Type[T], globs) -> str:
         return f'{type_str}({{}})'
     elif is_datamodel(t):
         globs[t.__name__] = t  # nasty mutation, shame on me
+        if inline_depth > 0 and _has_generated(t, 'from_dict'):
+            inline_expr = _gen_inline_from_dict(t, globs, inline_depth - 1, inline_max_size)
+            if len(inline_expr) <= inline_max_size:
+                return inline_expr
         return f'{t.__name__}.from_dict({{}})'
     elif is_dataclass(t):
+        globs[t.__name__] = t  # nasty mutation, shame on me
         return f'_structure_dataclass({t.__name__}, {{}})'
     else:
         origin_type = getattr(t, '__origin__', None)
         if origin_type:
             if origin_type in {list, set, frozenset}:
-                value_expr = _gen_structure_expression(t.__args__[0], globs).format('iv')
-                return f'{utils.type_to_str(origin_type)}({value_expr} for iv in {{}})'
+                value_expr = _gen_structure_expression(t.__args__[0], globs, **inline).format('iv')
+                return f'{utils.type_to_str(origin_type)}({utils.escape_braces(value_expr)} for iv in {{}})'
             elif origin_type == dict:
-                key_expr = _gen_structure_expression(t.__args__[0], globs).format('k')
-                value_expr = _gen_structure_expression(t.__args__[1], globs).format('iv')
+                key_expr = _gen_structure_expression(t.__args__[0], globs, **inline).format('k')
+                value_expr = _gen_structure_expression(t.__args__[1], globs, **inline).format('iv')
                 return utils.MyValTemplate(f'{{ {key_expr}: {value_expr} for k, iv in $MyVal.items() }}')
             elif origin_type == tuple:
                 if len(t.__args__) > 1 and t.__args__[1] == ...:  # tuple of any length Tuple[Any, ...]
-                    value_expr = _gen_structure_expression(t.__args__[0], globs).format('iv')
-                    return f'tuple({value_expr} for iv in {{}})'
+                    value_expr = _gen_structure_expression(t.__args__[0], globs, **inline).format('iv')
+                    return f'tuple({utils.escape_braces(value_expr)} for iv in {{}})'
                 else:  # fixed length tuple, e.g.: Tuple[str, int, str]
-                    expressions = [f'{_gen_structure_expression(it, globs).format(f"{{}}[{i}]")}'
+                    expressions = [_embed(_gen_structure_expression(it, globs, **inline), f'[{i}]')
                                    for i, it in enumerate(t.__args__)]
-                    expression = f'({",".join(expressions)},)'
-                    return expression.replace('{}', '{0}')
+                    return f'({",".join(expressions)},)'
             elif origin_type == typing.Union:
                 if len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721: this is Optional[T]:
-                    value_expr = _gen_structure_expression(t.__args__[0], globs).replace('{}', '{0}')
+                    value_expr = _embed(_gen_structure_expression(t.__args__[0], globs, **inline))
                     return f'(None if {{0}} is None else {value_expr})'
                 else:
                     # this is bit slower, but well, that's what you get for using Union
@@ -231,10 +345,80 @@ def _gen_structure_expression(t: Type[T], globs) -> str:
             raise ValueError(f'No structure hook function for type: {type_str}')
 
 
-def _build_from_dict(cls: Type[T]) -> Callable[[Type[T], Dict[str, Any]], T]:
+_array_typecodes = {
+    'int': 'q',
+    'float': 'd',
+}
+
+
+def _array_typecode(t, typecode=None) -> str:
+    if typecode:
+        return typecode
+    origin_type = getattr(t, '__origin__', None)
+    if origin_type == list or (origin_type == tuple and len(t.__args__) == 2 and t.__args__[1] == ...):
+        typecode = _array_typecodes.get(utils.type_to_str(t.__args__[0]))
+    if not typecode:
+        raise ValueError(f'Cannot infer array typecode for type: {utils.type_to_str(t)}')
+    return typecode
+
+
+def array_field(typecode: str = None, **kwargs) -> Field:
+    '''
+    `dataclasses.field` that stores the values to `array.array` instead of list of python objects.
+    If typecode is not given it's inferred from `List[int]`, `List[float]` or `Tuple[int/float, ...]` annotation.
+    Other kwargs are passed to `field`.
+    '''
+    metadata = dict(kwargs.pop('metadata', None) or {})
+    metadata['array'] = typecode
+    return field(metadata=metadata, **kwargs)
+
+
+def _gen_field_structure_expression(f: Field, t: Type[T], globs, prefix: str = '', **inline) -> str:
+    # per field hook in the field metadata wins over the type based hooks
+    hook = f.metadata.get('structure_hook')
+    if hook:
+        globs[f'structure_{prefix}{f.name}_field'] = hook  # nasty mutation, shame on me
+        return f'structure_{prefix}{f.name}_field({{}})'
+    elif 'array' in f.metadata:
+        globs['_array'] = array.array  # nasty mutation, shame on me
+        return f'_array("{_array_typecode(t, f.metadata["array"])}", {{}})'
+    else:
+        return _gen_structure_expression(t, globs, **inline)
+
+
+def _gen_init_kwargs(cls: Type[T], globs, source: str, prefix: str = '', **inline) -> typing.List[str]:
+    # returns list of '<field name>=<structure expression>' strs for structuring from dict expression source
+    # prefix is needed for the globs names of the inlined datamodels
     field_and_types = typing.get_type_hints(cls)
+    kwarg_exprs = []
+    for f in fields(cls):
+        if f.init:
+            t = field_and_types[(f.name)]
+            field_inline = inline
+            if is_dataclass(t):
+                globs[t.__name__] = t
+            if not isinstance(f.default, _MISSING_TYPE):
+                globs[f'{prefix}{f.name}_default'] = f.default
+                value_getter = f'{source}.get("{f.name}", {prefix}{f.name}_default)'
+            elif not isinstance(f.default_factory, _MISSING_TYPE):
+                globs[f'{prefix}{f.name}_default_factory'] = f.default_factory
+                value_getter = f'{source}.get("{f.name}", {prefix}{f.name}_default_factory())'
+                # inlining would evaluate the value getter, and so the default factory, once per nested field
+                field_inline = {}
+            else:
+                value_getter = f'{source}["{f.name}"]'
+            value_expr = _gen_field_structure_expression(f, t, globs, prefix, **field_inline).format(value_getter)
+            kwarg_exprs.append(f'{f.name}={value_expr}')
+    return kwarg_exprs
 
-    body_lines = []
+
+def _gen_inline_from_dict(t: Type[T], globs, inline_depth: int, inline_max_size: int) -> str:
+    kwarg_exprs = _gen_init_kwargs(t, globs, _VALUE, f'{t.__name__}_',
+                                   inline_depth=inline_depth, inline_max_size=inline_max_size)
+    return _to_template(f'{t.__name__}({", ".join(kwarg_exprs)})')
+
+
+def _build_from_dict(cls: Type[T], **inline) -> Callable[[Type[T], Dict[str, Any]], T]:
     globs = {
         'cls': cls,
         # no code building for these
@@ -242,26 +426,125 @@ def _build_from_dict(cls: Type[T]) -> Callable[[Type[T], Dict[str, Any]], T]:
         '_structure_value': _structure_value,
         '_structure_union': _structure_union,
     }
+    kwarg_exprs = _gen_init_kwargs(cls, globs, 'd', **inline)
+    body_lines = [f'  {kwarg_expr},' for kwarg_expr in kwarg_exprs]
+
+    return _create_fn('from_dict',
+                      ['cls', 'd'],
+                      ['return cls('] + body_lines + [')'],
+                      globals=globs, cls=cls,
+                      field_lines={i + 1: kwarg_expr.split('=', 1)[0] for i, kwarg_expr in enumerate(kwarg_exprs)})
+
+
+# trusted structuring
+# for input that is known to have the correct types already, e.g. from our own services:
+# values that already have the correct type are passed through as is, including collections of primitive values,
+# and only the values that have different type get converted
+_trusted_convert_types = {'str', 'int', 'float', 'complex', 'bool'}
+# elements of these are kept as is in the collections, float is not one of these as JSON has ints for whole floats
+_trusted_pass_through_types = {'str', 'int', 'bool', 'None', 'Any'}
+_trusted_structure_types = {
+    'datetime': datetime.datetime,
+    'date': datetime.date,
+}
+
 
+def _is_trusted_collection_origin(t) -> bool:
+    origin_type = getattr(t, '__origin__', None)
+    return origin_type in {list, set, frozenset} or \
+        (origin_type == tuple and len(t.__args__) > 1 and t.__args__[1] == ...)
+
+
+def _gen_trusted_structure_expression(t: Type[T], globs) -> str:
+    # retrurns str with '{0}' so that callers can call
+    # return_str.format(<value expression>)
+    # the value expression may be evaluated multiple times, so it should be a name
+    type_str = utils.type_to_str(t)
+    if _structure_hooks.get(type_str):
+        globs[f'structure_{type_str}'] = _structure_hooks.get(type_str)  # nasty mutation, shame on me
+        if type_str in _trusted_structure_types:
+            globs[f'_{type_str}_type'] = _trusted_structure_types[type_str]
+            return f'({{0}} if {{0}}.__class__ is _{type_str}_type else structure_{type_str}({{0}}))'
+        return f'structure_{type_str}({{0}})'
+    elif _is_direct_through_structure_type(type_str):
+        return '{0}'
+    elif type_str in _trusted_convert_types:
+        return f'({{0}} if {{0}}.__class__ is {type_str} else {type_str}({{0}}))'
+    elif is_datamodel(t):
+        globs[t.__name__] = t  # nasty mutation, shame on me
+        if _has_generated(t, 'from_trusted_dict'):
+            return f'{t.__name__}.from_trusted_dict({{0}})'
+        return f'{t.__name__}.from_dict({{0}})'
+    elif is_dataclass(t):
+        globs[t.__name__] = t  # nasty mutation, shame on me
+        return f'_structure_dataclass({t.__name__}, {{0}})'
+    origin_type = getattr(t, '__origin__', None)
+    if _is_trusted_collection_origin(t):
+        origin_str = utils.type_to_str(origin_type)
+        if utils.type_to_str(t.__args__[0]) in _trusted_pass_through_types:
+            return f'({{0}} if {{0}}.__class__ is {origin_str} else {origin_str}({{0}}))'
+        value_expr = utils.escape_braces(_gen_trusted_structure_expression(t.__args__[0], globs).format('iv'))
+        if origin_type == list:
+            return f'[{value_expr} for iv in {{0}}]'
+        elif origin_type == set:
+            return f'{{{{{value_expr} for iv in {{0}}}}}}'
+        return f'{origin_str}({value_expr} for iv in {{0}})'
+    elif origin_type == tuple:  # fixed length tuple, e.g.: Tuple[str, int, str]
+        if all(utils.type_to_str(it) in _trusted_pass_through_types for it in t.__args__):
+            return '({0} if {0}.__class__ is tuple else tuple({0}))'
+        expressions = [_embed(_gen_trusted_structure_expression(it, globs), f'[{i}]')
+                       for i, it in enumerate(t.__args__)]
+        return f'({",".join(expressions)},)'
+    elif origin_type == dict:
+        # JSON keys are always str, so the other key types need converting
+        if utils.type_to_str(t.__args__[0]) in {'str', 'Any'} and \
+                utils.type_to_str(t.__args__[1]) in _trusted_pass_through_types:
+            return '({0} if {0}.__class__ is dict else dict({0}))'
+        key_expr = utils.escape_braces(_gen_trusted_structure_expression(t.__args__[0], globs).format('k'))
+        value_expr = utils.escape_braces(_gen_trusted_structure_expression(t.__args__[1], globs).format('iv'))
+        return f'{{{{ {key_expr}: {value_expr} for k, iv in {{0}}.items() }}}}'
+    elif origin_type == typing.Union and len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721
+        value_expr = _embed(_gen_trusted_structure_expression(t.__args__[0], globs))
+        return f'(None if {{0}} is None else {value_expr})'
+    # the rest is same as in the checked path
+    return _gen_structure_expression(t, globs).replace('{}', '{0}')
+
+
+def _build_from_trusted_dict(cls: Type[T]) -> Callable[[Type[T], Dict[str, Any]], T]:
+    field_and_types = typing.get_type_hints(cls)
+    globs = {
+        'cls': cls,
+        '_structure_dataclass': _structure_dataclass,
+        '_structure_union': _structure_union,
+    }
+    value_lines = []
+    kwarg_lines = []
+    field_names = []
     for f in fields(cls):
         if f.init:
             t = field_and_types[(f.name)]
-            if is_dataclass(t):
-                globs[t.__name__] = t
+            # every value is bound to a local, so the expressions can refer to it multiple times
+            local_name = f'v_{f.name}'
             if not isinstance(f.default, _MISSING_TYPE):
                 globs[f'{f.name}_default'] = f.default
-                value_getter = f'd.get("{f.name}", {f.name}_default)'
+                value_lines.append(f'{local_name} = d.get("{f.name}", {f.name}_default)')
             elif not isinstance(f.default_factory, _MISSING_TYPE):
                 globs[f'{f.name}_default_factory'] = f.default_factory
-                value_getter = f'd.get("{f.name}", {f.name}_default_factory())'
+                value_lines.append(f'{local_name} = d["{f.name}"] if "{f.name}" in d else {f.name}_default_factory()')
+            else:
+                value_lines.append(f'{local_name} = d["{f.name}"]')
+            if f.metadata.get('structure_hook') or 'array' in f.metadata:
+                value_expr = _gen_field_structure_expression(f, t, globs).format(local_name)
             else:
-                value_getter = f'd["{f.name}"]'
-            body_lines.append(f'{f.name}={_gen_structure_expression(t, globs).format(value_getter)},\n')
+                value_expr = _gen_trusted_structure_expression(t, globs).format(local_name)
+            kwarg_lines.append(f'  {f.name}={value_expr},')
+            field_names.append(f.name)
 
-    return _create_fn('from_dict',
+    return _create_fn('from_trusted_dict',
                       ['cls', 'd'],
-                      ['return cls(\n'] + body_lines + [')'],
-                      globals=globs)
+                      value_lines + ['return cls('] + kwarg_lines + [')'],
+                      globals=globs, cls=cls,
+                      field_lines={len(value_lines) + 1 + i: name for i, name in enumerate(field_names)})
 
 
 # un structuring
@@ -272,7 +555,7 @@ def _to_serializeable(obj):
     elif _is_direct_through_unstructure_type(utils.type_to_str(type(obj))):
         return copy.deepcopy(obj)
     elif _is_dataclass_instance(obj):
-        return {f.name: _to_serializeable(getattr(obj, f.name)) for f in fields(obj)}
+        return {f.name: _to_serializeable_field(f, getattr(obj, f.name)) for f in fields(obj)}
     elif isinstance(obj, dict):
         return {_to_serializeable(k): _to_serializeable(v) for k, v in obj.items()}
     elif isinstance(obj, (list, tuple, set, frozenset)):
@@ -281,13 +564,23 @@ def _to_serializeable(obj):
         raise ValueError(f'No unstructure hook for type: {type(obj)}')
 
 
+def _to_serializeable_field(f: Field, v):
+    hook = f.metadata.get('unstructure_hook')
+    if hook:
+        return copy.deepcopy(hook(v))
+    else:
+        return _to_serializeable(v)
+
+
 def _is_direct_through_unstructure_type(type_str):
     return type_str in {'str', 'int', 'float', 'bool', 'None', 'Any'}
 
 
-def _gen_unstructure_expression(t, globs):
+def _gen_unstructure_expression(t, globs, inline_depth: int = 0, inline_max_size: int = _default_inline_max_size):
     # retrurns str with '{}' so that callers can call
     # return_str.format(<value expression>)
+    # with inline_depth > 0 the to_serializeable of nested datamodels is inlined instead of called
+    inline = dict(inline_depth=inline_depth, inline_max_size=inline_max_size)
     type_str = utils.type_to_str(t)
     if _unstructure_hooks.get(type_str):
         globs[f'unstructure_{type_str}'] = _unstructure_hooks.get(type_str)  # nasty mutation, shame on me
@@ -296,6 +589,11 @@ def _gen_unstructure_expression(t, globs):
         return '{}'
     elif is_datamodel(t):
         globs[t.__name__] = t  # nasty mutation, shame on me
+        # cached models keep their own to_serializeable so that the cache is used
+        if inline_depth > 0 and _has_generated(t, 'to_serializeable') and not _is_cached_datamodel(t):
+            inline_expr = _gen_inline_to_serializeable(t, globs, inline_depth - 1, inline_max_size)
+            if len(inline_expr) <= inline_max_size:
+                return inline_expr
         return '{}.to_serializeable()'
     elif is_dataclass(t):
         return '_to_serializeable({})'
@@ -303,15 +601,20 @@ def _gen_unstructure_expression(t, globs):
         origin_type = getattr(t, '__origin__', None)
         if origin_type:
             if origin_type == dict:
-                key_expr = _gen_unstructure_expression(t.__args__[0], globs).format("k")
-                value_expr = _gen_unstructure_expression(t.__args__[1], globs).format("iv")
+                key_expr = _gen_unstructure_expression(t.__args__[0], globs, **inline).format("k")
+                value_expr = _gen_unstructure_expression(t.__args__[1], globs, **inline).format("iv")
                 return utils.MyValTemplate(f'{{ {key_expr}: {value_expr} for k, iv in $MyVal.items() }}')
+            elif origin_type == tuple and not (len(t.__args__) > 1 and t.__args__[1] == ...):
+                # fixed length tuple, e.g.: Tuple[str, int, str]
+                expressions = [_embed(_gen_unstructure_expression(it, globs, **inline), f'[{i}]')
+                               for i, it in enumerate(t.__args__)]
+                return f'[{", ".join(expressions)}]'
             elif origin_type in {list, tuple, set, frozenset}:
-                value_expr = _gen_unstructure_expression(t.__args__[0], globs).format("iv")
-                return f'[{value_expr} for iv in {{}}]'
+                value_expr = _gen_unstructure_expression(t.__args__[0], globs, **inline).format("iv")
+                return f'[{utils.escape_braces(value_expr)} for iv in {{}}]'
             elif origin_type == typing.Union:
                 if len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721: this is Optional[T]:
-                    value_expr = _gen_unstructure_expression(t.__args__[0], globs).replace('{}', '{0}')
+                    value_expr = _embed(_gen_unstructure_expression(t.__args__[0], globs, **inline))
                     return f'(None if {{0}} is None else {value_expr})'
                 else:
                     return '_to_serializeable({})'
@@ -319,29 +622,414 @@ def _gen_unstructure_expression(t, globs):
             raise ValueError(f'No unstructure hook function for type: {type_str}')
 
 
-def _build_to_serializeable(cls: Type[T]) -> Callable[[T], Dict[str, Any]]:
-    field_and_types = typing.get_type_hints(cls)
-    body_lines = []
-    globs = {
-        '_to_serializeable': _to_serializeable
-    }
+def _gen_field_unstructure_expression(f: Field, t, globs, prefix: str = '', **inline):
+    # per field hook in the field metadata wins over the type based hooks
+    hook = f.metadata.get('unstructure_hook')
+    if hook:
+        globs[f'unstructure_{prefix}{f.name}_field'] = hook  # nasty mutation, shame on me
+        return f'unstructure_{prefix}{f.name}_field({{}})'
+    elif 'array' in f.metadata:
+        # instances made with __init__ can have any sequence, e.g. list, instead of array
+        globs['_array'] = array.array  # nasty mutation, shame on me
+        return '({0}.tolist() if {0}.__class__ is _array else list({0}))'
+    else:
+        return _gen_unstructure_expression(t, globs, **inline)
+
 
+def _gen_dict_items(cls: Type[T], globs, source: str, prefix: str = '', **inline) -> typing.List[str]:
+    # returns list of '"<field name>": <unstructure expression>' strs for unstructuring the object expression source
+    # prefix is needed for the globs names of the inlined datamodels
+    field_and_types = typing.get_type_hints(cls)
+    item_exprs = []
     for f in fields(cls):
         # perhaps could have some mechanism for optionally filtering fields out
         t = field_and_types[(f.name)]
-        get_attribute_str = f'self.{f.name}'
-        body_lines.append(f'"{f.name}": {_gen_unstructure_expression(t, globs).format(get_attribute_str)},\n')
+        value_expr = _gen_field_unstructure_expression(f, t, globs, prefix, **inline).format(f'{source}.{f.name}')
+        item_exprs.append(f'"{f.name}": {value_expr}')
+    return item_exprs
+
+
+def _gen_inline_to_serializeable(t, globs, inline_depth: int, inline_max_size: int) -> str:
+    item_exprs = _gen_dict_items(t, globs, _VALUE, f'{t.__name__}_',
+                                 inline_depth=inline_depth, inline_max_size=inline_max_size)
+    return _to_template(f'{{{", ".join(item_exprs)}}}')
+
+
+def _build_to_serializeable(cls: Type[T], **inline) -> Callable[[T], Dict[str, Any]]:
+    globs = {
+        '_to_serializeable': _to_serializeable
+    }
+    body_lines = [f'  {item_expr},' for item_expr in _gen_dict_items(cls, globs, 'self', **inline)]
 
     return _create_fn('to_serializeable',
                       ['self'],
                       ['return {'] + body_lines + ['}'],
-                      globals=globs)
+                      globals=globs, cls=cls,
+                      field_lines={i + 1: f.name for i, f in enumerate(fields(cls))})
+
+
+def _build_cached_to_serializeable(cls: Type[T], **inline) -> Callable[[T], Dict[str, Any]]:
+    # same as _build_to_serializeable, but the dict is built only once per instance
+    # and stored to the instance __dict__, which is fine as the instance is frozen
+    globs = {
+        '_to_serializeable': _to_serializeable
+    }
+    body_lines = [f'    {item_expr},' for item_expr in _gen_dict_items(cls, globs, 'self', **inline)]
+
+    return _create_fn('to_serializeable',
+                      ['self'],
+                      [f'd = self.__dict__.get("{_serialized_cache_attr}")',
+                       'if d is None:',
+                       '  d = {'] + body_lines + ['  }',
+                                                  f'  self.__dict__["{_serialized_cache_attr}"] = d',
+                                                  'return d'],
+                      globals=globs, cls=cls,
+                      field_lines={i + 3: f.name for i, f in enumerate(fields(cls))})
+
+
+def _is_cached_datamodel(t) -> bool:
+    return is_datamodel(t) and getattr(t, '__datamodel_cache_serialized__', False)
+
+
+def _gen_json_fragment_expression(t, globs):
+    # retrurns str with '{}' so that callers can call
+    # return_str.format(<value expression>)
+    # or None if there is no better way than to json dump the unstructured value
+    if _is_cached_datamodel(t):
+        return '{}.to_json()'
+    origin_type = getattr(t, '__origin__', None)
+    if origin_type in {list, set, frozenset} or \
+            (origin_type == tuple and len(t.__args__) > 1 and t.__args__[1] == ...):
+        if _is_cached_datamodel(t.__args__[0]):
+            return '"[" + ", ".join([iv.to_json() for iv in {}]) + "]"'
+    elif origin_type == dict and utils.type_to_str(t.__args__[0]) == 'str':
+        if _is_cached_datamodel(t.__args__[1]):
+            return '"{{" + ", ".join([_json_dumps(k) + ": " + iv.to_json() for k, iv in {}.items()]) + "}}"'
+    elif origin_type == typing.Union:
+        if len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721: this is Optional[T]:
+            if _is_cached_datamodel(t.__args__[0]):
+                return '("null" if {0} is None else {0}.to_json())'
+    return None
+
+
+def _build_cached_to_json(cls: Type[T]) -> Callable[[T], JSONstr]:
+    # builds the JSON string from per field fragments, so that the cached JSON strings
+    # of the child models get reused instead of dumping their dicts again
+    field_and_types = typing.get_type_hints(cls)
+    fragment_lines = []
+    globs = {
+        '_to_serializeable': _to_serializeable,
+        '_json_dumps': _json_dumps,
+    }
+
+    for i, f in enumerate(fields(cls)):
+        t = field_and_types[(f.name)]
+        get_attribute_str = f'self.{f.name}'
+        key_str = ('{' if i == 0 else ', ') + json.dumps(f.name) + ': '
+        if f.metadata.get('unstructure_hook') or 'array' in f.metadata:
+            fragment_expr = None
+        else:
+            fragment_expr = _gen_json_fragment_expression(t, globs)
+        if fragment_expr is None:
+            value_expr = _gen_field_unstructure_expression(f, t, globs).format(get_attribute_str)
+            fragment_expr = f'_json_dumps({value_expr})'
+        else:
+            fragment_expr = fragment_expr.format(get_attribute_str)
+        fragment_lines.append(f'  {key_str!r},\n')
+        fragment_lines.append(f'  {fragment_expr},\n')
+
+    body_lines = [f's = self.__dict__.get("{_json_cache_attr}")',
+                  'if s is None:',
+                  '  s = "".join((\n']
+    body_lines += fragment_lines
+    body_lines += [f'  {"}" if fragment_lines else "{}"!r},\n',
+                   '  ))',
+                   f'  self.__dict__["{_json_cache_attr}"] = s',
+                   'return s']
+    return _create_fn('to_json',
+                      ['self'],
+                      body_lines,
+                      globals=globs, cls=cls)
+
+
+# streaming
+def _gen_json_fragment_statements(t, value_expr: str, globs, depth: int = 0) -> typing.List[str]:
+    # returns lines of code that yield the JSON of value_expr as fragments,
+    # collections are yielded element by element and nested datamodels field by field
+    origin_type = getattr(t, '__origin__', None)
+    if _is_cached_datamodel(t):
+        return [f'yield {value_expr}.to_json()']
+    elif is_datamodel(t) and _has_generated(t, '_json_fragments') and _has_generated(t, 'to_serializeable'):
+        return [f'yield from {value_expr}._json_fragments(encode)']
+    elif (origin_type == list or (origin_type == tuple and len(t.__args__) > 1 and t.__args__[1] == ...)) \
+            and _gen_unstructure_expression(t.__args__[0], globs) == '{}':
+        # no need to unstructure the values, so encode them in slices
+        i = f'i{depth}'
+        return ['yield "["',
+                f'for {i} in range(0, len({value_expr}), {_json_slice_size}):',
+                f'  yield ", " if {i} else ""',
+                f'  yield encode({value_expr}[{i}:{i} + {_json_slice_size}])[1:-1]',
+                'yield "]"']
+    elif origin_type in {list, set, frozenset} or \
+            (origin_type == tuple and len(t.__args__) > 1 and t.__args__[1] == ...):
+        iv, sep = f'iv{depth}', f'sep{depth}'
+        value_lines = _gen_json_fragment_statements(t.__args__[0], iv, globs, depth + 1)
+        return ['yield "["',
+                f'{sep} = ""',
+                f'for {iv} in {value_expr}:',
+                f'  yield {sep}',
+                f'  {sep} = ", "'] + [f'  {line}' for line in value_lines] + ['yield "]"']
+    elif origin_type == dict and utils.type_to_str(t.__args__[0]) == 'str':
+        k, iv, sep = f'k{depth}', f'iv{depth}', f'sep{depth}'
+        value_lines = _gen_json_fragment_statements(t.__args__[1], iv, globs, depth + 1)
+        return ['yield "{"',
+                f'{sep} = ""',
+                f'for {k}, {iv} in {value_expr}.items():',
+                f'  yield {sep} + encode({k}) + ": "',
+                f'  {sep} = ", "'] + [f'  {line}' for line in value_lines] + ['yield "}"']
+    elif origin_type == typing.Union and len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721
+        value_lines = _gen_json_fragment_statements(t.__args__[0], value_expr, globs, depth)
+        return [f'if {value_expr} is None:',
+                '  yield "null"',
+                'else:'] + [f'  {line}' for line in value_lines]
+    else:
+        return [f'yield encode({_gen_unstructure_expression(t, globs).format(value_expr)})']
+
+
+def _build_json_fragments(cls: Type[T]) -> Callable[[T, Callable[[Any], JSONstr]], typing.Iterator[JSONstr]]:
+    # generator of the same JSON as to_json in small fragments, encode is the encode method of json encoder
+    field_and_types = typing.get_type_hints(cls)
+    globs = {
+        '_to_serializeable': _to_serializeable,
+    }
+    body_lines = []
+    for i, f in enumerate(fields(cls)):
+        t = field_and_types[(f.name)]
+        body_lines.append(f'yield {("{" if i == 0 else ", ") + json.dumps(f.name) + ": "!r}')
+        if f.metadata.get('unstructure_hook') or 'array' in f.metadata:
+            value_expr = _gen_field_unstructure_expression(f, t, globs).format(f'self.{f.name}')
+            body_lines.append(f'yield encode({value_expr})')
+        else:
+            body_lines += _gen_json_fragment_statements(t, f'self.{f.name}', globs)
+    body_lines.append('yield "}"' if body_lines else 'yield "{}"')
+
+    return _create_fn('_json_fragments',
+                      ['self', 'encode'],
+                      body_lines,
+                      globals=globs, cls=cls)
+
+
+def _iter_json_chunks(obj: T, chunk_size: int = _default_chunk_size) -> typing.Iterator[JSONstr]:
+    encode = _json_encoder().encode
+    chunk = []
+    size = 0
+    for fragment in obj._json_fragments(encode):
+        chunk.append(fragment)
+        size += len(fragment)
+        if size >= chunk_size:
+            yield ''.join(chunk)
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _dump_json(obj: T, fp: typing.TextIO, chunk_size: int = _default_chunk_size) -> None:
+    for chunk in obj.iter_json_chunks(chunk_size):
+        fp.write(chunk)
+
+
+# copying
+def _is_immutable_type(t) -> bool:
+    # values of immutable types can be shared between the original and the copy
+    type_str = utils.type_to_str(t)
+    if type_str in {'str', 'int', 'float', 'complex', 'bool', 'bytes', 'None', 'datetime', 'date', 'time', 'timedelta'}:
+        return True
+    elif is_dataclass(t):
+        if not t.__dataclass_params__.frozen:
+            return False
+        field_and_types = typing.get_type_hints(t)
+        return all(not f.metadata and _is_immutable_type(field_and_types[f.name]) for f in fields(t))
+    origin_type = getattr(t, '__origin__', None)
+    if origin_type == frozenset:
+        return _is_immutable_type(t.__args__[0])
+    elif origin_type == tuple:
+        return all(_is_immutable_type(it) for it in t.__args__ if it != ...)
+    elif origin_type == typing.Union:
+        return all(_is_immutable_type(it) for it in t.__args__)
+    return False
+
+
+# classes of the values that can be shared between the original and the copy, on top of the frozen models
+_immutable_classes = frozenset({str, int, float, complex, bool, bytes, type(None),
+                                datetime.datetime, datetime.date, datetime.time, datetime.timedelta, tuple, frozenset})
+
+
+def _add_shared_classes(t, shared_classes: set):
+    # frozen dataclasses of the immutable type t can be shared as well
+    if is_dataclass(t):
+        shared_classes.add(t)
+        field_and_types = typing.get_type_hints(t)
+        for f in fields(t):
+            _add_shared_classes(field_and_types[f.name], shared_classes)
+    for it in getattr(t, '__args__', None) or ():
+        _add_shared_classes(it, shared_classes)
+
+
+def _gen_memoized_copy_expression(copy_expr, expected_type: type) -> str:
+    # values referenced from multiple places are copied once and the copies reference the same copy, as with deepcopy
+    # __init__ doesn't convert the values, so the values of unexpected type go through deepcopy
+    return (f'(memo[id({{0}})] if id({{0}}) in memo else _memoize(memo, {{0}}, {_embed(copy_expr)}) '
+            f'if {{0}}.__class__ is {utils.type_to_str(expected_type)} else _deepcopy({{0}}, memo))')
+
+
+def _memoize(memo: Dict[int, Any], v: Any, copied: Any) -> Any:
+    memo[id(v)] = copied
+    return copied
+
+
+def _gen_copy_expression(t, globs) -> str:
+    # retrurns str with '{}' so that callers can call
+    # return_str.format(<value expression>)
+    # only the mutable parts are copied, and deepcopy is used for whatever this cannot reason about
+    if _is_immutable_type(t):
+        # the type is from the annotation, so the class of the value is checked before sharing it
+        _add_shared_classes(t, globs['_shared_classes'])  # nasty mutation, shame on me
+        return '({0} if {0}.__class__ in _shared_classes else _deepcopy({0}, memo))'
+    elif is_datamodel(t) and _has_generated(t, '__deepcopy__'):
+        return '{}.__deepcopy__(memo)'
+    elif is_dataclass(t):
+        return '_deepcopy({}, memo)'
+    origin_type = getattr(t, '__origin__', None)
+    if origin_type in {list, set, frozenset} or \
+            (origin_type == tuple and len(t.__args__) > 1 and t.__args__[1] == ...):
+        value_expr = utils.escape_braces(_gen_copy_expression(t.__args__[0], globs).format('iv'))
+        if origin_type == list:
+            return _gen_memoized_copy_expression(f'[{value_expr} for iv in {{}}]', list)
+        return _gen_memoized_copy_expression(f'{utils.type_to_str(origin_type)}({value_expr} for iv in {{}})',
+                                             origin_type)
+    elif origin_type == tuple:  # fixed length tuple, e.g.: Tuple[str, int, str]
+        expressions = [_embed(_gen_copy_expression(it, globs), f'[{i}]') for i, it in enumerate(t.__args__)]
+        return _gen_memoized_copy_expression(f'({",".join(expressions)},)', tuple)
+    elif origin_type == dict:
+        # keys are hashable, so those are shared
+        value_expr = _gen_copy_expression(t.__args__[1], globs).format('iv')
+        return _gen_memoized_copy_expression(
+            utils.MyValTemplate(f'{{ k: {value_expr} for k, iv in $MyVal.items() }}'), dict)
+    elif origin_type == typing.Union and len(t.__args__) == 2 and t.__args__[1] == type(None):  # noqa: E721
+        value_expr = _embed(_gen_copy_expression(t.__args__[0], globs))
+        return f'(None if {{0}} is None else {value_expr})'
+    return '_deepcopy({}, memo)'
+
+
+def _build_deepcopy(cls: Type[T]) -> Callable[[T, Dict[int, Any]], T]:
+    field_and_types = typing.get_type_hints(cls)
+    globs = {
+        '_deepcopy': copy.deepcopy,
+        '_memoize': _memoize,
+        '_field_names': frozenset(f.name for f in fields(cls)),
+        '_shared_classes': set(_immutable_classes),
+    }
+    body_lines = []
+    for f in fields(cls):
+        t = field_and_types[(f.name)]
+        # field specific hooks can have any type of values, so no sharing for them
+        copy_expr = '_deepcopy({}, memo)' if f.metadata else _gen_copy_expression(t, globs)
+        copy_line = f'd["{f.name}"] = {copy_expr.format(f"self.{f.name}")}'
+        if not f.init and isinstance(f.default, _MISSING_TYPE) and isinstance(f.default_factory, _MISSING_TYPE):
+            # might not be set at all
+            body_lines += [f'if "{f.name}" in d:', f'  {copy_line}']
+        else:
+            body_lines.append(copy_line)
+
+    return _create_fn('__deepcopy__',
+                      ['self', 'memo=None'],
+                      ['if memo is None:',
+                       '  memo = {}',
+                       # nested models call this directly, not through deepcopy
+                       'if id(self) in memo:',
+                       '  return memo[id(self)]',
+                       'cls = self.__class__',
+                       'new = cls.__new__(cls)',
+                       'memo[id(self)] = new',
+                       'd = new.__dict__',
+                       # the fields get overwritten, this copies the attributes that are not fields
+                       # and leaves out the unset fields
+                       'd.update(self.__dict__)'] + body_lines + [
+                       # attributes that are not fields can be anything
+                       'if not _field_names.issuperset(d):',
+                       '  for k in d.keys() - _field_names:',
+                       '    d[k] = _deepcopy(d[k], memo)',
+                       'return new'],
+                      globals=globs, cls=cls)
+
+
+def _clone(obj: T) -> T:
+    return obj.__deepcopy__({})
+
+
+# pickling
+def _build_pickle_methods(cls: Type[T]) -> Dict[str, Callable]:
+    # state is tuple of the field values in field order instead of the instance __dict__,
+    # and unpickling creates the instance with cls.__new__ and fills the __dict__ without calling __init__
+    # init=False fields without default might not be set, those are _MISSING_TYPE instances in the state
+    maybe_unset = {f.name for f in fields(cls) if not f.init and isinstance(f.default, _MISSING_TYPE)
+                   and isinstance(f.default_factory, _MISSING_TYPE)}
+    state_expr = ''.join(f'_getattr(self, "{f.name}", _missing), ' if f.name in maybe_unset else f'self.{f.name}, '
+                         for f in fields(cls))
+    slotted = '__slots__' in cls.__dict__
+    if (slotted or maybe_unset) and fields(cls):
+        setstate_lines = [] if slotted else ['d = self.__dict__']
+        setstate_lines.append(f'{"".join(f"v_{f.name}, " for f in fields(cls))}= state')
+        for f in fields(cls):
+            # slotted instances have no __dict__ to fill
+            line = f'_setattr(self, "{f.name}", v_{f.name})' if slotted else f'd["{f.name}"] = v_{f.name}'
+            if f.name in maybe_unset:
+                line = f'if v_{f.name}.__class__ is not _MISSING_TYPE: {line}'
+            setstate_lines.append(line)
+    else:
+        state_targets = ''.join(f'd["{f.name}"], ' for f in fields(cls))
+        setstate_lines = ['d = self.__dict__',
+                          f'{state_targets}= state' if state_targets else 'pass']
+    globs = {
+        'cls': cls,
+        '_newobj': copyreg.__newobj__,
+        '_fields': fields,
+        '_field_names': tuple(f.name for f in fields(cls)),
+        '_getattr': getattr,
+        '_setattr': object.__setattr__,
+        '_missing': MISSING,
+        '_MISSING_TYPE': _MISSING_TYPE,
+    }
+    # the state knows only the fields of cls, so the fields of subclasses that are not datamodels would be lost
+    check_class_lines = ['if self.__class__ is not cls and '
+                         'tuple(f.name for f in _fields(self.__class__)) != _field_names:',
+                         '  raise TypeError(f"compact pickle state of {cls.__qualname__} can not pickle '
+                         '{self.__class__.__qualname__} with other fields, make it a datamodel")']
+    return {
+        '__reduce__': _create_fn('__reduce__',
+                                 ['self'],
+                                 check_class_lines + [f'return (_newobj, (self.__class__,), ({state_expr}))'],
+                                 globals=globs, cls=cls),
+        '__getstate__': _create_fn('__getstate__',
+                                   ['self'],
+                                   check_class_lines + [f'return ({state_expr})'],
+                                   globals=globs, cls=cls),
+        '__setstate__': _create_fn('__setstate__',
+                                   ['self', 'state'],
+                                   setstate_lines,
+                                   globals=globs, cls=cls),
+    }
 
 
 def _json_load(cls: Type[T], json_str: JSONstr) -> T:
     return cls.from_dict(json.loads(json_str))
 
 
+def _json_dumps(v: Any) -> JSONstr:
+    return json.dumps(v, cls=_json_encoder)
+
+
 def _json_dump(obj: T) -> JSONstr:
     return json.dumps(obj.to_serializeable(), cls=_json_encoder)
 
@@ -351,24 +1039,69 @@ _allowed_dataclasskws = ['init', 'repr', 'eq', 'order', 'unsafe_hash', 'frozen']
 
 def datamodel(_cls=None, *, pre_hooks=[], post_hooks=[], **kwargs):
 
-    def wrapper(Cls):
+    def _process_class(Cls):
         for hook in pre_hooks:
             Cls = hook(Cls, kwargs)
 
+        cache_serialized = kwargs.get('cache_serialized', False)
+        if cache_serialized and not kwargs.get('frozen', False):
+            raise ValueError('cache_serialized=True requires frozen=True')
+        inline = dict(inline_depth=kwargs.get('inline_depth', 0),
+                      inline_max_size=kwargs.get('inline_max_size', _default_inline_max_size))
+
         base = dataclass(**{k: v for k, v in kwargs.items() if k in _allowed_dataclasskws})(Cls)
-        # never overwrite existing attribute
-        _set_new_attribute(base, 'to_serializeable', _build_to_serializeable(Cls))
-        _set_new_attribute(base, 'from_dict', classmethod(_build_from_dict(Cls)))
-        _set_new_attribute(base, 'to_json', _json_dump)
-        _set_new_attribute(base, 'from_json', classmethod(_json_load))
+        base.__datamodel_cache_serialized__ = cache_serialized
+        # subclasses of compact pickled models need their own pickle methods for their own fields
+        compact_pickle = kwargs.get('compact_pickle', getattr(base, '__datamodel_compact_pickle__', False))
+        base.__datamodel_compact_pickle__ = compact_pickle
+        if cache_serialized:
+            methods = {
+                'to_serializeable': _build_cached_to_serializeable(Cls, **inline),
+                'to_json': _build_cached_to_json(Cls),
+            }
+        else:
+            methods = {
+                'to_serializeable': _build_to_serializeable(Cls, **inline),
+                'to_json': _json_dump,
+            }
+        methods['from_dict'] = classmethod(_build_from_dict(Cls, **inline))
+        methods['from_trusted_dict'] = classmethod(_build_from_trusted_dict(Cls))
+        methods['from_json'] = classmethod(_json_load)
+        methods['_json_fragments'] = _build_json_fragments(Cls)
+        methods['iter_json_chunks'] = _iter_json_chunks
+        methods['dump_json'] = _dump_json
+        if '__slots__' not in base.__dict__:
+            methods['__deepcopy__'] = _build_deepcopy(Cls)
+            methods['clone'] = _clone
+        if compact_pickle:
+            methods.update(_build_pickle_methods(Cls))
+
+        sources = []
+        for name, method in methods.items():
+            # never overwrite existing attribute
+            if not _set_new_attribute(base, name, method) and _generated_source(method):
+                sources.append(_generated_source(method))
+        base.__datamodel_source__ = '\n'.join(sources)
 
         for hook in post_hooks:
             base = hook(base, kwargs)
 
         return base
 
+    def wrapper(Cls):
+        # the hooks registered while the methods are generated would be seen only by some of the methods
+        with _registry_lock:
+            return _process_class(Cls)
+
     # See if we're being called as @datamodel or @datamodel()
     if _cls is None:
         return wrapper
     else:
         return wrapper(_cls)
+
+
+# needs the datamodel stuff above
+from datamodels.bulk import bulk_from_dicts, bulk_to_serializeable  # noqa: E402
+from datamodels.collection import ModelCollection  # noqa: E402
+from datamodels.memory import memory_report  # noqa: E402
+from datamodels.timings import field_timings  # noqa: E402
@@ -0,0 +1,205 @@
+'''
+In memory collection of datamodel instances with hash and sorted indexes on fields.
+
+Indexes are declared either in the field metadata of the model:
+
+    @datamodel(frozen=True)
+    class User:
+        id: int = field(metadata={'index': 'hash'})
+        age: int = field(metadata={'index': 'sorted'})
+
+or with the `indexes` argument, e.g. `ModelCollection(User, indexes={'id': 'hash'})`. Hash indexes serve point
+queries (`get`), sorted indexes both point and range queries (`range`). Values of sorted index fields need to be
+comparable with each other. Indexes are maintained on `add` and `remove`, but the collection doesn't know if indexed
+fields of the instances are mutated, so frozen models are a good fit.
+'''
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, TextIO, Type, TypeVar
+
+from datamodels import fields, is_datamodel
+
+T = TypeVar('T')
+
+_index_kinds = ('hash', 'sorted')
+
+
+class _HashIndex:
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        self.buckets = {}  # value -> {id(obj): obj}
+
+    def add(self, obj):
+        key = getattr(obj, self.field_name)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = {id(obj): obj}
+        else:
+            bucket[id(obj)] = obj
+
+    def extend(self, objs):
+        for obj in objs:
+            self.add(obj)
+
+    def remove(self, obj):
+        key = getattr(obj, self.field_name)
+        bucket = self.buckets[key]
+        del bucket[id(obj)]
+        if not bucket:
+            del self.buckets[key]
+
+    def get(self, value) -> List[Any]:
+        bucket = self.buckets.get(value)
+        return list(bucket.values()) if bucket else []
+
+
+class _SortedIndex:
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        # parallel lists sorted by the key, items with equal keys in the insertion order
+        self.keys = []
+        self.objs = []
+
+    def add(self, obj):
+        key = getattr(obj, self.field_name)
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.objs.insert(i, obj)
+
+    def extend(self, objs):
+        # one sort is way faster than inserting one by one
+        field_name = self.field_name
+        keys = self.keys + [getattr(obj, field_name) for obj in objs]
+        all_objs = self.objs + list(objs)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[i] for i in order]
+        self.objs = [all_objs[i] for i in order]
+
+    def remove(self, obj):
+        key = getattr(obj, self.field_name)
+        for i in range(bisect_left(self.keys, key), bisect_right(self.keys, key)):
+            if self.objs[i] is obj:
+                del self.keys[i]
+                del self.objs[i]
+                return
+        raise KeyError(key)
+
+    def get(self, value) -> List[Any]:
+        return self.objs[bisect_left(self.keys, value):bisect_right(self.keys, value)]
+
+    def range(self, low, high, include_low: bool, include_high: bool) -> List[Any]:
+        if low is None:
+            start = 0
+        elif include_low:
+            start = bisect_left(self.keys, low)
+        else:
+            start = bisect_right(self.keys, low)
+        if high is None:
+            end = len(self.keys)
+        elif include_high:
+            end = bisect_right(self.keys, high)
+        else:
+            end = bisect_left(self.keys, high)
+        return self.objs[start:end]
+
+
+_index_classes = {
+    'hash': _HashIndex,
+    'sorted': _SortedIndex,
+}
+
+
+class ModelCollection(Generic[T]):
+    '''
+    Collection of instances of a datamodel class with indexes on fields.
+    Each instance can be in the collection once, identity is the instance itself not the equality.
+    '''
+    def __init__(self, model: Type[T], items: Iterable[T] = (), indexes: Optional[Dict[str, str]] = None):
+        if not is_datamodel(model):
+            raise ValueError(f'ModelCollection requires datamodel class, got: {model}')
+        self.model = model
+        field_indexes = {f.name: f.metadata['index'] for f in fields(model) if 'index' in f.metadata}
+        field_indexes.update(indexes or {})
+        field_names = set(f.name for f in fields(model))
+        self._indexes = {}
+        for field_name, kind in field_indexes.items():
+            if field_name not in field_names:
+                raise ValueError(f'No field: {field_name} in {model.__name__}')
+            if kind not in _index_kinds:
+                raise ValueError(f'Unknown index: {kind} for field: {field_name}, expected one of: '
+                                 f'{", ".join(_index_kinds)}')
+            self._indexes[field_name] = _index_classes[kind](field_name)
+        self._items = {}  # id(obj) -> obj
+        self.extend(items)
+
+    @classmethod
+    def from_dicts(cls, model: Type[T], dicts: Iterable[Dict[str, Any]],
+                   indexes: Optional[Dict[str, str]] = None) -> 'ModelCollection[T]':
+        return cls(model, indexes=indexes).load_dicts(dicts)
+
+    @classmethod
+    def from_jsonl(cls, model: Type[T], fp: TextIO, indexes: Optional[Dict[str, str]] = None) -> 'ModelCollection[T]':
+        return cls(model, indexes=indexes).load_jsonl(fp)
+
+    def load_dicts(self, dicts: Iterable[Dict[str, Any]]) -> 'ModelCollection[T]':
+        from_dict = self.model.from_dict
+        self.extend([from_dict(d) for d in dicts])
+        return self
+
+    def load_jsonl(self, fp: TextIO) -> 'ModelCollection[T]':
+        # one JSON object per line, empty lines are skipped
+        return self.load_dicts(json.loads(line) for line in fp if line.strip())
+
+    def add(self, obj: T):
+        if id(obj) in self._items:
+            return
+        self._items[id(obj)] = obj
+        for index in self._indexes.values():
+            index.add(obj)
+
+    def extend(self, objs: Iterable[T]):
+        items = self._items
+        new_objs = []
+        for obj in objs:
+            if id(obj) not in items:
+                items[id(obj)] = obj
+                new_objs.append(obj)
+        for index in self._indexes.values():
+            index.extend(new_objs)
+
+    def remove(self, obj: T):
+        if id(obj) not in self._items:
+            raise KeyError(obj)
+        for index in self._indexes.values():
+            index.remove(obj)
+        del self._items[id(obj)]
+
+    def get(self, field_name: str, value: Any) -> List[T]:
+        '''
+        Returns the instances which have the field value equal to value.
+        Uses the index of the field if there is one, otherwise scans all the instances.
+        '''
+        index = self._indexes.get(field_name)
+        if index is not None:
+            return index.get(value)
+        return [obj for obj in self._items.values() if getattr(obj, field_name) == value]
+
+    def range(self, field_name: str, low: Any = None, high: Any = None,
+              include_low: bool = True, include_high: bool = False) -> List[T]:
+        '''
+        Returns the instances which have the field value between low and high in the order of the field values.
+        None for low or high means no limit. Requires sorted index on the field.
+        '''
+        index = self._indexes.get(field_name)
+        if not isinstance(index, _SortedIndex):
+            raise ValueError(f'Range query requires sorted index on field: {field_name}')
+        return index.range(low, high, include_low, include_high)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(list(self._items.values()))
+
+    def __contains__(self, obj) -> bool:
+        return id(obj) in self._items
@@ -0,0 +1,154 @@
+'''
+Deep memory footprint of datamodel (and dataclass) instances, per class and per field.
+
+Bytes of nested dataclass instances are reported under their own class, so the fields of the parent contain only
+the containers and the values that are not dataclass instances. Instance attributes that are not fields, e.g. the
+cached serialized dict and JSON of `cache_serialized` models, are reported under their attribute names. Objects
+reachable from multiple places are counted once, to the first place found. Large collections are sampled: only
+`sample_size` evenly spaced elements are walked and the result is scaled up by the length of the collection, so the
+report is an estimate for those. Objects reached more than once from the samples are taken as shared and not scaled.
+'''
+import sys
+import typing
+from typing import Any, Dict, Iterable, Union
+
+from datamodels import datamodel, field, fields, _is_dataclass_instance
+
+_default_sample_size = 1000
+
+
+@datamodel
+class ClassMemory:
+    count: int = 0
+    # instance itself and it's __dict__
+    instance_bytes: int = 0
+    fields: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bytes(self) -> int:
+        return self.instance_bytes + sum(self.fields.values())
+
+
+@datamodel
+class MemoryReport:
+    total_bytes: int
+    classes: Dict[str, ClassMemory]
+    sampled: bool = False
+
+    def format(self) -> str:
+        lines = [f'{"total":<40}{self.total_bytes:>16,}' + (' (estimate from samples)' if self.sampled else '')]
+        for class_name, class_memory in sorted(self.classes.items(), key=lambda kv: -kv[1].bytes):
+            lines.append(f'{class_name:<40}{class_memory.bytes:>16,} in {class_memory.count:,} instances')
+            lines.append(f'  {"<instance>":<38}{class_memory.instance_bytes:>16,}')
+            for field_name, field_bytes in sorted(class_memory.fields.items(), key=lambda kv: -kv[1]):
+                lines.append(f'  {field_name:<38}{field_bytes:>16,}')
+        return '\n'.join(lines)
+
+
+class _Walker:
+    def __init__(self, sample_size: int):
+        self.sample_size = sample_size
+        self.seen = set()
+        self.sampled = False
+        # id -> number of references from the walked objects, counted before the sizes
+        self.references = {}
+        # class name -> [count, instance bytes, {field name: bytes}], as floats because of the sampling weights
+        self.classes = {}
+
+    def _sample(self, values, weight: float):
+        # returns the values to walk and the weight for each of those
+        n = len(values)
+        if n <= self.sample_size:
+            return values, weight
+        self.sampled = True
+        if not isinstance(values, typing.Sequence):
+            values = list(values)
+        step = n / self.sample_size
+        return [values[int(i * step)] for i in range(self.sample_size)], weight * step
+
+    def _attributes(self, obj):
+        # fields and the other instance attributes, in that order
+        attributes = {f.name: getattr(obj, f.name) for f in fields(obj) if hasattr(obj, f.name)}
+        for name, v in getattr(obj, '__dict__', {}).items():
+            attributes.setdefault(name, v)
+        return attributes.items()
+
+    def _children(self, v) -> Iterable[Any]:
+        if _is_dataclass_instance(v):
+            return [av for _, av in self._attributes(v)]
+        elif isinstance(v, dict):
+            items, _ = self._sample(list(v.items()) if len(v) > self.sample_size else v.items(), 1.0)
+            return [kv for item in items for kv in item]
+        elif isinstance(v, (list, tuple, set, frozenset)):
+            values, _ = self._sample(v, 1.0)
+            return values
+        return ()
+
+    def count_references(self, root):
+        # the objects reached more than once are shared, so those are not scaled with the sample weights
+        references = self.references
+        stack = [root]
+        while stack:
+            v = stack.pop()
+            n = references.get(id(v), 0)
+            references[id(v)] = n + 1
+            if n == 0:
+                stack.extend(self._children(v))
+
+    def instance(self, obj, weight: float = 1.0):
+        class_stats = self.classes.setdefault(type(obj).__qualname__, [0.0, 0.0, {}])
+        class_stats[0] += weight
+        instance_bytes = sys.getsizeof(obj)
+        if hasattr(obj, '__dict__'):
+            instance_bytes += sys.getsizeof(obj.__dict__)
+        class_stats[1] += instance_bytes * weight
+        field_stats = class_stats[2]
+        for name, v in self._attributes(obj):
+            field_stats[name] = field_stats.get(name, 0.0) + self.value(v, weight)
+
+    def value(self, v: Any, weight: float = 1.0) -> float:
+        # returns bytes of v and the objects reachable from it, except the dataclass instances which are
+        # reported under their own class
+        if id(v) in self.seen:
+            return 0.0
+        self.seen.add(id(v))
+        if self.references.get(id(v), 1) > 1:
+            weight = 1.0
+        if _is_dataclass_instance(v):
+            self.instance(v, weight)
+            return 0.0
+
+        size = sys.getsizeof(v) * weight
+        if isinstance(v, dict):
+            items, item_weight = self._sample(list(v.items()) if len(v) > self.sample_size else v.items(), weight)
+            for k, iv in items:
+                size += self.value(k, item_weight) + self.value(iv, item_weight)
+        elif isinstance(v, (list, tuple, set, frozenset)):
+            values, value_weight = self._sample(v, weight)
+            for iv in values:
+                size += self.value(iv, value_weight)
+        return size
+
+
+def memory_report(obj_or_iterable: Union[Any, Iterable[Any]], sample_size: int = _default_sample_size) -> MemoryReport:
+    '''
+    Reports deep memory usage of datamodel instance or iterable of those (e.g. list or ModelCollection).
+    Collections longer than sample_size, including the given iterable, are sampled.
+    '''
+    walker = _Walker(sample_size)
+    if _is_dataclass_instance(obj_or_iterable):
+        roots, weight = [obj_or_iterable], 1.0
+    else:
+        objs = obj_or_iterable if hasattr(obj_or_iterable, '__len__') else list(obj_or_iterable)
+        roots, weight = walker._sample(objs, 1.0)
+    for obj in roots:
+        walker.count_references(obj)
+    total = sum(walker.value(obj, weight) for obj in roots)
+
+    classes = {}
+    for class_name, (count, instance_bytes, field_stats) in walker.classes.items():
+        class_memory = ClassMemory(round(count), round(instance_bytes),
+                                   {field_name: round(b) for field_name, b in field_stats.items()})
+        classes[class_name] = class_memory
+        total += class_memory.instance_bytes + sum(field_stats.values())
+    return MemoryReport(round(total), classes, walker.sampled)
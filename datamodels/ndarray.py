@@ -0,0 +1,92 @@
+'''
+`numpy.ndarray` fields for datamodels.
+
+Importing this module registers the (un)structure hooks for `numpy.ndarray` typed fields, so import it *before*
+the `datamodel` definitions, same as with any other hooks. Fields typed as plain `numpy.ndarray` are unstructured
+to (nested) lists and structured with `numpy.asarray`, so the dtype is inferred from the values.
+
+Use `ndarray_field` to fix the dtype and shape of the field and to pick a more compact encoding:
+* `'list'`: (nested) lists, e.g. `[1.0, 2.0]`
+* `'base64'`: base64 encoded str of the raw array bytes, safe to `json.dumps`
+* `'bytes'`: raw array bytes, for binary formats
+
+The raw bytes don't contain the shape, so the buffer encodings need `shape` for multi-dimensional arrays.
+Structuring accepts any of those regardless of the encoding of the field. Buffers (`bytes`, `bytearray`,
+`memoryview`, ...) are wrapped with `numpy.frombuffer` without copying them, so arrays made from `bytes` are read
+only. The base64 str is decoded to a `bytearray`, so those arrays are writable.
+'''
+import base64
+from typing import Any, Optional, Tuple
+
+import numpy
+
+from datamodels import field, structure_hook, unstructure_hook
+
+
+_encodings = ('list', 'base64', 'bytes')
+
+
+class NDArrayCodec:
+    '''
+    (Un)structure functions for single ndarray field with fixed dtype, shape and encoding.
+    Shape may contain one -1 for the free dimension, as in `numpy.reshape`.
+    '''
+    def __init__(self, dtype: Any = None, shape: Optional[Tuple[int, ...]] = None, encoding: str = 'list'):
+        if encoding not in _encodings:
+            raise ValueError(f'Unknown ndarray encoding: {encoding}, expected one of: {", ".join(_encodings)}')
+        if encoding != 'list' and dtype is None:
+            raise ValueError(f'ndarray encoding: {encoding} requires dtype')
+        self.dtype = None if dtype is None else numpy.dtype(dtype)
+        self.shape = None if shape is None else tuple(shape)
+        self.encoding = encoding
+
+    def structure(self, v: Any) -> numpy.ndarray:
+        if isinstance(v, numpy.ndarray):
+            arr = numpy.asarray(v, dtype=self.dtype)
+        elif isinstance(v, str):
+            arr = numpy.frombuffer(bytearray(base64.b64decode(v)), dtype=self._buffer_dtype())
+        elif isinstance(v, (bytes, bytearray, memoryview)):
+            arr = numpy.frombuffer(v, dtype=self._buffer_dtype())
+        else:
+            arr = numpy.asarray(v, dtype=self.dtype)
+
+        if self.shape is not None and arr.shape != self.shape:
+            arr = arr.reshape(self.shape)
+        return arr
+
+    def unstructure(self, arr: numpy.ndarray) -> Any:
+        if self.encoding == 'list':
+            return arr.tolist()
+        if self.shape is None and arr.ndim != 1:
+            raise ValueError(f'ndarray encoding: {self.encoding} requires shape for {arr.ndim} dimensional array')
+        data = numpy.ascontiguousarray(arr, dtype=self.dtype).tobytes()
+        if self.encoding == 'base64':
+            return base64.b64encode(data).decode('ascii')
+        else:
+            return data
+
+    def _buffer_dtype(self):
+        return numpy.float64 if self.dtype is None else self.dtype
+
+
+def ndarray_field(dtype: Any = None, shape: Optional[Tuple[int, ...]] = None, encoding: str = 'list', **kwargs):
+    '''
+    `dataclasses.field` for `numpy.ndarray` fields with dtype, shape and encoding, other kwargs are passed to `field`
+    '''
+    codec = NDArrayCodec(dtype, shape, encoding)
+    metadata = dict(kwargs.pop('metadata', None) or {})
+    metadata.update(structure_hook=codec.structure, unstructure_hook=codec.unstructure, ndarray=codec)
+    return field(metadata=metadata, **kwargs)
+
+
+_default_codec = NDArrayCodec()
+
+
+@structure_hook('ndarray')
+def _structure_ndarray(v: Any) -> numpy.ndarray:
+    return _default_codec.structure(v)
+
+
+@unstructure_hook('ndarray')
+def _unstructure_ndarray(arr: numpy.ndarray) -> list:
+    return arr.tolist()
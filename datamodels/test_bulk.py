@@ -0,0 +1,62 @@
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import datamodels
+from datamodels import bulk_from_dicts, bulk_to_serializeable
+
+
+@datamodels.datamodel
+class Item:
+    id: int
+    name: str
+    tags: typing.List[str]
+
+
+def _dicts(n):
+    return [{'id': i, 'name': f'item {i}', 'tags': [str(i)]} for i in range(n)]
+
+
+def test_bulk_from_dicts_and_to_serializeable_keep_order():
+    dicts = _dicts(1050)
+    for max_workers in (1, 4):
+        items = bulk_from_dicts(Item, iter(dicts), max_workers=max_workers, chunk_size=100)
+        assert items == [Item.from_dict(d) for d in dicts]
+        assert bulk_to_serializeable(items, max_workers=max_workers, chunk_size=100) == dicts
+    assert bulk_from_dicts(Item, dicts, trusted=True) == [Item.from_dict(d) for d in dicts]
+    with ThreadPoolExecutor(2) as pool:
+        assert bulk_to_serializeable(bulk_from_dicts(Item, dicts, executor=pool), executor=pool) == dicts
+    assert bulk_from_dicts(Item, []) == []
+    with pytest.raises(ValueError):
+        bulk_from_dicts(Item, dicts, chunk_size=0)
+
+
+def test_models_and_hooks_can_be_defined_from_multiple_threads():
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    results = [None] * n_threads
+
+    def define(i):
+        type_str = f'ThreadedStr{i}'
+        barrier.wait()
+        datamodels.structure_hook(type_str)(str.upper)
+        datamodels.unstructure_hook(type_str)(str.lower)
+        custom_type = typing.NewType(type_str, str)
+
+        @datamodels.datamodel
+        class Threaded:
+            x: int
+            y: custom_type
+
+        obj = Threaded.from_dict({'x': str(i), 'y': 'foo'})
+        results[i] = (obj.x, obj.y, obj.to_serializeable()['y'])
+
+    threads = [threading.Thread(target=define, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i in range(n_threads):
+        datamodels._structure_hooks.pop(f'ThreadedStr{i}')
+        datamodels._unstructure_hooks.pop(f'ThreadedStr{i}')
+    assert results == [(i, 'FOO', 'foo') for i in range(n_threads)]
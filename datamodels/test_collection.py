@@ -0,0 +1,80 @@
+import io
+import pytest
+import datamodels
+from datamodels import ModelCollection
+
+
+@datamodels.datamodel(frozen=True)
+class User:
+    id: int = datamodels.field(metadata={'index': 'hash'})
+    name: str = ''
+    age: int = datamodels.field(default=0, metadata={'index': 'sorted'})
+
+
+def _users():
+    return [User(i, f'user {i}', 20 + i % 10) for i in range(100)]
+
+
+def test_indexes_from_field_metadata():
+    users = _users()
+    collection = ModelCollection(User, users)
+    assert len(collection) == 100
+    assert collection.get('id', 5) == [users[5]]
+    assert collection.get('id', 500) == []
+    assert collection.get('age', 25) == [u for u in users if u.age == 25]
+    assert collection.get('name', 'user 7') == [users[7]]  # no index, scan
+
+
+def test_range_queries():
+    users = _users()
+    collection = ModelCollection(User, users)
+    result = collection.range('age', 22, 24)
+    assert [u.age for u in result] == [22] * 10 + [23] * 10
+    assert set(result) == set(u for u in users if 22 <= u.age < 24)
+    assert len(collection.range('age', 22, 24, include_low=False, include_high=True)) == 20
+    assert len(collection.range('age', high=21)) == 10
+    assert len(collection.range('age', low=29)) == 10
+    with pytest.raises(ValueError):
+        collection.range('id', 1, 2)
+
+
+def test_add_and_remove_maintain_indexes():
+    users = _users()
+    collection = ModelCollection(User, users[:50], indexes={'name': 'hash'})
+    for u in users[50:]:
+        collection.add(u)
+    collection.add(users[0])
+    assert len(collection) == 100
+    assert collection.range('age', 20, 21) == [u for u in users if u.age == 20]
+    collection.remove(users[10])
+    assert users[10] not in collection
+    assert users[11] in collection
+    assert collection.get('id', 10) == []
+    assert collection.get('name', 'user 10') == []
+    assert users[10] not in collection.range('age', 20, 21)
+    assert len(collection.range('age', 20, 21)) == 9
+    with pytest.raises(KeyError):
+        collection.remove(users[10])
+    # equal but not the same instance
+    with pytest.raises(KeyError):
+        collection.remove(User(11, 'user 11', 21))
+
+
+def test_bulk_loading():
+    users = _users()
+    from_dicts = ModelCollection.from_dicts(User, [u.to_serializeable() for u in users])
+    jsonl = io.StringIO('\n'.join(u.to_json() for u in users) + '\n\n')
+    from_jsonl = ModelCollection.from_jsonl(User, jsonl)
+    for collection in (from_dicts, from_jsonl):
+        assert list(collection) == users
+        assert collection.get('id', 3) == [users[3]]
+        assert collection.range('age', 29) == [u for u in users if u.age == 29]
+
+
+def test_invalid_indexes():
+    with pytest.raises(ValueError):
+        ModelCollection(User, indexes={'foo': 'hash'})
+    with pytest.raises(ValueError):
+        ModelCollection(User, indexes={'name': 'btree'})
+    with pytest.raises(ValueError):
+        ModelCollection(int)
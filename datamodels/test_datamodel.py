@@ -1,5 +1,10 @@
+import array
+import copy
 import dataclasses
 import datetime
+import io
+import json
+import pickle
 import typing
 import pytest
 import datamodels
@@ -462,3 +467,561 @@ def test_structuring_of_inner_dataclasses():
         expected_dict={'dc': dc_dict, 'dcl': [dc_dict]},
         expected_json=f'{{"dc": {dc_json}, "dcl": [{dc_json}]}}'
     )
+
+
+@datamodels.datamodel(frozen=True, cache_serialized=True)
+class CachedChild:
+    x: int
+    y: str
+
+
+@datamodels.datamodel(frozen=True, cache_serialized=True)
+class CachedParent:
+    child: CachedChild
+    children: typing.List[CachedChild]
+    optional_child: typing.Optional[CachedChild]
+    dt: datetime.datetime
+
+
+def test_cached_serialization_deserialization():
+    dt = datetime.datetime.now()
+    dm = CachedParent(CachedChild(1, 'a'), [CachedChild(2, 'b')], None, dt)
+    _assert_serialization_deserialization(
+        dm,
+        expected_dict={
+            'child': {'x': 1, 'y': 'a'},
+            'children': [{'x': 2, 'y': 'b'}],
+            'optional_child': None,
+            'dt': dt.isoformat(),
+        },
+        expected_json='{"child": {"x": 1, "y": "a"}, "children": [{"x": 2, "y": "b"}], ' +
+                      f'"optional_child": null, "dt": "{dt.isoformat()}"}}'
+    )
+
+
+@datamodels.datamodel(frozen=True, cache_serialized=True)
+class CachedDictParent:
+    by_key: typing.Dict[str, CachedChild]
+
+
+def test_cached_serialization_reuses_cached_json_of_dict_values():
+    child = CachedChild(1, 'a')
+    dm = CachedDictParent({'a"b': child, 'c': CachedChild(2, 'b')})
+    assert dm.to_json() == json.dumps(dm.to_serializeable())
+    assert CachedDictParent.from_json(dm.to_json()) == dm
+    assert 'iv.to_json()' in CachedDictParent.to_json.__datamodel_source__
+    assert CachedDictParent({}).to_json() == '{"by_key": {}}'
+
+
+def test_cached_serialization_is_computed_once():
+    child = CachedChild(1, 'a')
+    dm = CachedParent(child, [child], child, datetime.datetime.now())
+    assert dm.to_serializeable() is dm.to_serializeable()
+    assert dm.to_json() is dm.to_json()
+    assert dm.to_serializeable()['child'] is child.to_serializeable()
+    assert dm.to_serializeable()['children'][0] is child.to_serializeable()
+    assert dm == CachedParent.from_json(dm.to_json())
+    assert dataclasses.replace(dm, child=CachedChild(2, 'b')).to_json().startswith('{"child": {"x": 2, "y": "b"}')
+
+
+def test_cached_serialization_requires_frozen():
+    with pytest.raises(ValueError):
+        @datamodels.datamodel(cache_serialized=True)
+        class NotFrozen:
+            x: int
+
+
+@datamodels.datamodel
+class WithArrays:
+    a: typing.List[int] = datamodels.array_field()
+    b: typing.Tuple[float, ...] = datamodels.array_field(default_factory=lambda: array.array('d'))
+    c: array.array = datamodels.array_field('b', default_factory=lambda: array.array('b'))
+
+
+def test_array_fields():
+    dm = WithArrays.from_dict({'a': range(3), 'b': [1, 2.5], 'c': (-1, 1)})
+    assert dm.a == array.array('q', [0, 1, 2])
+    assert dm.b == array.array('d', [1.0, 2.5])
+    assert dm.c == array.array('b', [-1, 1])
+    _assert_serialization_deserialization(
+        dm,
+        expected_dict={'a': [0, 1, 2], 'b': [1.0, 2.5], 'c': [-1, 1]},
+        expected_json='{"a": [0, 1, 2], "b": [1.0, 2.5], "c": [-1, 1]}'
+    )
+    assert WithArrays.from_dict({'a': []}).b == array.array('d')
+
+
+def test_array_fields_constructed_with_lists():
+    dm = WithArrays([1, 2], (0.5,))
+    d = {'a': [1, 2], 'b': [0.5], 'c': []}
+    assert dm.to_serializeable() == d
+    assert json.loads(dm.to_json()) == d
+    assert json.loads(''.join(dm.iter_json_chunks())) == d
+    assert WithArrays.from_dict(d).a == array.array('q', [1, 2])
+
+
+def test_array_fields_fail_for_non_numeric_types():
+    with pytest.raises(ValueError):
+        @datamodels.datamodel
+        class WithStrArray:
+            a: typing.List[str] = datamodels.array_field()
+
+    with pytest.raises(OverflowError):
+        WithArrays.from_dict({'a': [], 'c': [1000]})
+
+
+@dataclasses.dataclass
+class InnerDataClassWithArray:
+    a: typing.List[float] = datamodels.array_field()
+
+
+@datamodels.datamodel
+class DataClassWithArrayContainer:
+    dc: InnerDataClassWithArray
+
+
+def test_array_fields_in_inner_dataclasses():
+    dm = DataClassWithArrayContainer.from_dict({'dc': {'a': [1, 2]}})
+    assert dm.dc.a == array.array('d', [1, 2])
+    assert dm.to_serializeable() == {'dc': {'a': [1.0, 2.0]}}
+
+
+@datamodels.datamodel(inline_depth=2)
+class InlinedNestedDataClasses:
+    a: Simple
+    b: typing.List[Simple]
+    c: typing.Dict[str, NestedDataClasses]
+    d: typing.Optional[WithDefaultValues]
+    e: typing.List[typing.Dict[str, int]] = dataclasses.field(default_factory=list)
+
+
+def test_inlined_nested_datamodels():
+    nested = NestedDataClasses(Simple(1, 'a'), [Simple(2, 'b')], {'c': Simple(3, 'c')})
+    dm = InlinedNestedDataClasses(Simple(1, 'a'), [Simple(2, 'b')], {'n': nested}, WithDefaultValues(1), [{'a': 1}])
+    d = {
+        'a': {'x': 1, 'y': 'a'},
+        'b': [{'x': 2, 'y': 'b'}],
+        'c': {'n': nested.to_serializeable()},
+        'd': {'x': 1, 'y': 2, 'z': []},
+        'e': [{'a': 1}],
+    }
+    _assert_serialization_deserialization(dm, expected_dict=d, expected_json=json.dumps(d))
+    assert InlinedNestedDataClasses.from_dict({**d, 'd': {'x': 1}}) == dm
+    assert InlinedNestedDataClasses.from_dict({**d, 'd': None}).d is None
+    assert '.from_dict(' not in InlinedNestedDataClasses.__datamodel_source__
+    assert '.to_serializeable()' not in InlinedNestedDataClasses.__datamodel_source__
+
+    @datamodels.datamodel(inline_depth=1)
+    class InlinedTuple:
+        t: typing.Tuple[Simple, WithDefaultValues]
+
+    dm = InlinedTuple((Simple(1, 'a'), WithDefaultValues(2, 3)))
+    d = {'t': [{'x': 1, 'y': 'a'}, {'x': 2, 'y': 3, 'z': []}]}
+    _assert_serialization_deserialization(dm, expected_dict=d, expected_json=json.dumps(d))
+    assert '.to_serializeable()' not in InlinedTuple.to_serializeable.__datamodel_source__
+
+
+def test_inline_depth_and_size_limits():
+    @datamodels.datamodel(inline_depth=1)
+    class InlinedOneLevel:
+        c: typing.Dict[str, NestedDataClasses]
+
+    assert 'Simple.from_dict(' in InlinedOneLevel.__datamodel_source__
+    assert 'NestedDataClasses.from_dict(' not in InlinedOneLevel.__datamodel_source__
+
+    @datamodels.datamodel(inline_depth=2, inline_max_size=10)
+    class NotInlined:
+        c: typing.Dict[str, NestedDataClasses]
+
+    assert 'NestedDataClasses.from_dict(' in NotInlined.__datamodel_source__
+    assert '.to_serializeable()' in NotInlined.__datamodel_source__
+
+
+def test_generated_source():
+    assert Simple.__datamodel_source__.startswith(
+        'def to_serializeable(self):\n'
+        '  return {\n'
+        '    "x": self.x,\n'
+        '    "y": self.y,\n'
+        '  }\n'
+        '\n'
+        'def from_dict(cls, d):\n'
+        '  return cls(\n'
+        '    x=int(d["x"]),\n'
+        '    y=str(d["y"]),\n'
+        '  )\n'
+    )
+
+
+@datamodels.datamodel(frozen=True)
+class FrozenSimple:
+    x: int
+    dt: datetime.datetime
+
+
+@datamodels.datamodel
+class ToCopy:
+    simple: Simple
+    frozen: FrozenSimple
+    simples: typing.List[Simple]
+    by_key: typing.Dict[str, typing.List[int]]
+    pair: typing.Tuple[str, typing.Set[int]]
+    anything: typing.Any = None
+
+
+def test_clone_and_deepcopy():
+    dm = ToCopy(Simple(1, 'a'), FrozenSimple(2, datetime.datetime.now()), [Simple(3, 'b')],
+                {'a': [1, 2]}, ('b', {3}), {'nested': [1]})
+    for copied in (dm.clone(), copy.deepcopy(dm)):
+        assert copied == dm
+        assert copied.simple is not dm.simple
+        assert copied.frozen is dm.frozen
+        assert copied.simples is not dm.simples and copied.simples[0] is not dm.simples[0]
+        assert copied.by_key['a'] is not dm.by_key['a']
+        assert copied.pair[1] is not dm.pair[1]
+        assert copied.anything['nested'] is not dm.anything['nested']
+        copied.simples[0].x = 4
+        copied.by_key['a'].append(3)
+        assert dm.simples[0].x == 3
+        assert dm.by_key == {'a': [1, 2]}
+
+
+def test_deepcopy_keeps_references_through_memo():
+    shared = [1]
+    dm = ToCopy(Simple(1, 'a'), FrozenSimple(2, datetime.datetime.now()), [], {}, ('b', set()), [shared, shared])
+    copied = copy.deepcopy([dm, dm])
+    assert copied[0] is copied[1]
+    assert copied[0].anything[0] is copied[0].anything[1]
+
+
+@datamodels.datamodel
+class SharedReferences:
+    a: Simple
+    b: Simple
+    l1: typing.List[int]
+    l2: typing.List[int]
+    d1: typing.Dict[str, typing.List[int]]
+    d2: typing.Dict[str, typing.List[int]]
+
+
+def test_deepcopy_keeps_shared_fields_shared():
+    s = Simple(1, 'a')
+    lst = [1]
+    d = {'l': lst}
+    dm = SharedReferences(s, s, lst, lst, d, d)
+    dm.extra = [lst]
+    for copied in (dm.clone(), copy.deepcopy(dm)):
+        assert copied.a is copied.b and copied.a is not s
+        assert copied.l1 is copied.l2 and copied.l1 is not lst
+        assert copied.d1 is copied.d2 and copied.d1 is not d
+        assert copied.d1['l'] is copied.l1
+        assert copied.extra is not dm.extra and copied.extra[0] is copied.l1
+
+
+@datamodels.datamodel
+class WithImmutableAnnotations:
+    tags: typing.Tuple[str, ...]
+    names: typing.FrozenSet[str]
+    frozen: FrozenSimple
+    by_key: typing.Dict[str, str]
+    pair: typing.List[typing.Tuple[int, int]]
+
+
+def test_deepcopy_copies_mutable_values_of_immutable_annotations():
+    # __init__ doesn't convert, so the values can be mutable regardless of the annotation
+    dm = WithImmutableAnnotations(['a'], {'b'}, FrozenSimple(1, datetime.datetime.now()), {'k': ['v']}, [[1, 2]])
+    for copied in (dm.clone(), copy.deepcopy(dm)):
+        assert copied == dm
+        copied.tags.append('c')
+        copied.names.add('c')
+        copied.by_key['k'].append('w')
+        copied.pair[0].append(3)
+        assert dm == WithImmutableAnnotations(['a'], {'b'}, dm.frozen, {'k': ['v']}, [[1, 2]])
+    dm = WithImmutableAnnotations(('a',), frozenset('b'), dm.frozen, {}, [(1, 2)])
+    copied = dm.clone()
+    assert copied.tags is dm.tags and copied.names is dm.names and copied.frozen is dm.frozen
+    assert copied.pair[0] is dm.pair[0]
+
+
+def test_clone_unset_no_init_values():
+    @datamodels.datamodel
+    class WithUnsetNoInit:
+        a: int
+        b: typing.List[int] = dataclasses.field(init=False)
+
+    copied = WithUnsetNoInit(1).clone()
+    assert copied.a == 1 and not hasattr(copied, 'b')
+
+
+def test_clone_no_init_values():
+    dm = WithNoInit(1)
+    dm.b = 5
+    assert dm.clone().b == 5
+    dm = WithDefaultValues(1, z=[1])
+    assert dm.clone().z is not dm.z
+
+
+@datamodels.datamodel(compact_pickle=True)
+class CompactPickleChild:
+    x: int
+    y: str = 'y'
+
+
+@datamodels.datamodel(frozen=True, compact_pickle=True)
+class CompactPickleFrozen:
+    a: CompactPickleChild
+    b: typing.List[CompactPickleChild]
+    c: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+    d: int = dataclasses.field(init=False, default=2)
+
+
+@datamodels.datamodel(compact_pickle=True)
+class CompactPickleEmpty:
+    pass
+
+
+@datamodels.datamodel
+class DefaultPickleChild:
+    x: int
+    y: str = 'y'
+
+
+@datamodels.datamodel(compact_pickle=True)
+class CompactPicklePostInit:
+    x: int
+
+    def __post_init__(self):
+        self.x += 1
+
+
+@datamodels.datamodel
+class CompactPickleSubclass(CompactPickleChild):
+    z: str = 'z'
+
+
+@dataclasses.dataclass
+class CompactPicklePlainSubclass(CompactPickleChild):
+    z: str = 'z'
+
+
+class CompactPickleNoNewFields(CompactPickleChild):
+    pass
+
+
+@datamodels.datamodel(compact_pickle=True)
+class CompactPickleSlots:
+    __slots__ = ('x', 'y')
+    x: int
+    y: typing.List[int]
+
+
+@datamodels.datamodel(frozen=True, compact_pickle=True)
+class CompactPickleUnset:
+    x: int
+    unset: typing.List[int] = dataclasses.field(init=False)
+
+
+def test_compact_pickle_round_trip():
+    dm = CompactPickleFrozen(CompactPickleChild(1), [CompactPickleChild(2, 'b')], {'c': 3})
+    object.__setattr__(dm, 'd', 5)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(dm, protocol))
+        assert unpickled == dm
+        assert unpickled.d == 5
+        assert unpickled.a is not dm.a
+    assert pickle.loads(pickle.dumps(CompactPickleEmpty())) == CompactPickleEmpty()
+    assert copy.copy(dm) == dm
+
+
+def test_compact_pickle_subclasses():
+    dm = CompactPickleSubclass(1, 'yy', 'zz')
+    assert dm.__getstate__() == (1, 'yy', 'zz')
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(dm, protocol))
+        assert type(unpickled) is CompactPickleSubclass
+        assert unpickled == dm
+    with pytest.raises(TypeError):
+        pickle.dumps(CompactPicklePlainSubclass(1, 'yy', 'zz'))
+    unpickled = pickle.loads(pickle.dumps(CompactPickleNoNewFields(1, 'yy')))
+    assert type(unpickled) is CompactPickleNoNewFields
+    assert unpickled == CompactPickleNoNewFields(1, 'yy')
+
+
+def test_compact_pickle_slots_and_unset_fields():
+    dm = CompactPickleSlots(1, [2])
+    for copied in (pickle.loads(pickle.dumps(dm)), copy.deepcopy(dm)):
+        assert copied == dm
+        assert copied.y is not dm.y
+    dm = CompactPickleUnset(1)
+    unpickled = pickle.loads(pickle.dumps(dm))
+    assert unpickled.x == 1
+    assert not hasattr(unpickled, 'unset')
+    object.__setattr__(dm, 'unset', [3])
+    assert pickle.loads(pickle.dumps(dm)).unset == [3]
+
+
+def test_compact_pickle_state():
+    dm = CompactPickleChild(1)
+    assert dm.__getstate__() == (1, 'y')
+    assert dm.__reduce__()[2] == (1, 'y')
+    default_dm = DefaultPickleChild(1)
+    assert len(pickle.dumps(dm, pickle.HIGHEST_PROTOCOL)) < len(pickle.dumps(default_dm, pickle.HIGHEST_PROTOCOL))
+
+
+def test_compact_pickle_does_not_call_init():
+    assert pickle.loads(pickle.dumps(CompactPicklePostInit(1))).x == 2
+
+
+@datamodels.datamodel
+class StreamedItem:
+    x: int
+    tags: typing.List[str]
+    scores: typing.Dict[str, typing.List[float]]
+    child: typing.Optional[Simple] = None
+
+
+@datamodels.datamodel
+class StreamedDocument:
+    items: typing.List[StreamedItem]
+    groups: typing.Dict[str, typing.List[StreamedItem]]
+    by_int: typing.Dict[int, str]
+    cached: typing.List[CachedChild]
+    dt: datetime.datetime
+    pair: typing.Tuple[int, str]
+    numbers: typing.List[int] = datamodels.array_field()
+    empty: typing.List[StreamedItem] = dataclasses.field(default_factory=list)
+
+
+def test_json_chunks_are_identical_to_to_json():
+    items = [StreamedItem(i, ['a', 'ö"'], {'s': [i * 0.5]}, Simple(i, 'c') if i % 2 else None) for i in range(3000)]
+    dm = StreamedDocument(items, {'g': items[:2], 'empty': []}, {1: 'a'}, [CachedChild(1, 'a')],
+                          datetime.datetime.now(), (1, 'b'), array.array('q', range(5000)))
+    expected = dm.to_json()
+    for chunk_size in (1, 100, 65536):
+        chunks = list(dm.iter_json_chunks(chunk_size))
+        assert ''.join(chunks) == expected
+        assert len(chunks) > 1 or chunk_size > len(expected)
+    fp = io.StringIO()
+    dm.dump_json(fp)
+    assert fp.getvalue() == expected
+    assert ''.join(CompactPickleEmpty().iter_json_chunks()) == '{}'
+
+
+def test_json_chunk_size():
+    dm = SimpleWithCollections([str(i) for i in range(10000)], {str(i): i for i in range(10000)})
+    chunks = list(dm.iter_json_chunks(1000))
+    assert ''.join(chunks) == dm.to_json()
+    assert max(len(c) for c in chunks[:-1]) < 1000 + 1024 * 8
+
+
+@datamodels.datamodel
+class TrustedMixed:
+    i: int
+    f: float
+    s: str
+    dt: datetime.datetime
+    d: datetime.date
+    nested: NestedDataClasses
+    dcs: typing.List[InnerDataClass]
+    ints: typing.List[int]
+    dates: typing.Set[datetime.date]
+    by_key: typing.Dict[str, typing.List[datetime.datetime]]
+    pair: typing.Tuple[int, datetime.date]
+    any_len: typing.Tuple[str, ...]
+    opt: typing.Optional[typing.Dict[str, Simple]] = None
+    union: typing.Union[int, str] = 1
+    numbers: typing.List[float] = datamodels.array_field(default_factory=lambda: array.array('d'))
+    with_default: typing.FrozenSet[str] = dataclasses.field(default_factory=frozenset)
+    floats: typing.List[float] = dataclasses.field(default_factory=list)
+    float_by_key: typing.Dict[str, float] = dataclasses.field(default_factory=dict)
+    float_pair: typing.Tuple[float, float] = (0.0, 0.0)
+
+
+def test_trusted_structuring_matches_checked_structuring():
+    dt = datetime.datetime.now()
+    dc = {'x': 1, 'y': 'a', 'dt': dt, 'l': [1, 2]}
+    d = {
+        'i': 1, 'f': 2, 's': 'a', 'dt': dt.isoformat(), 'd': dt.date(),
+        'nested': {'a': {'x': 1, 'y': 'a'}, 'b': [{'x': 2, 'y': 'b'}], 'c': {'c': {'x': 3, 'y': 'c'}}},
+        'dcs': [dc],
+        'ints': [1, 2],
+        'dates': [dt.date().isoformat()],
+        'by_key': {'a': [dt, dt.isoformat()]},
+        'pair': [1, dt.date().isoformat()],
+        'any_len': ['a', 'b'],
+        'opt': {'s': {'x': 1, 'y': 'a'}},
+        'union': 'u',
+        'numbers': [1.5],
+        'floats': [1, 2.5],
+        'float_by_key': {'a': 1},
+        'float_pair': [1, 2],
+    }
+    checked = TrustedMixed.from_dict(d)
+    trusted = TrustedMixed.from_trusted_dict(d)
+    assert trusted == checked
+    assert isinstance(trusted.f, float)
+    # whole floats are ints in JSON
+    assert [type(v) for v in trusted.floats] == [float, float]
+    assert type(trusted.float_by_key['a']) is float
+    assert [type(v) for v in trusted.float_pair] == [float, float]
+    assert trusted.to_json() == checked.to_json()
+    assert trusted.pair == (1, dt.date())
+    assert trusted.any_len == ('a', 'b')
+    assert trusted.with_default == frozenset()
+    assert TrustedMixed.from_trusted_dict(checked.to_serializeable()) == checked
+    assert TrustedMixed.from_trusted_dict({**d, 'opt': None}).opt is None
+
+
+def test_trusted_structuring_converts_json_keys():
+    @datamodels.datamodel
+    class WithIntKeys:
+        m: typing.Dict[int, str]
+        n: typing.Dict[float, typing.List[int]]
+
+    dm = WithIntKeys({1: 'a'}, {0.5: [1]})
+    d = json.loads(dm.to_json())
+    assert d == {'m': {'1': 'a'}, 'n': {'0.5': [1]}}
+    assert WithIntKeys.from_trusted_dict(d) == WithIntKeys.from_dict(d) == dm
+
+
+def test_trusted_structuring_passes_through_matching_values():
+    ints = [1, 2]
+    dm = TrustedMixed.from_trusted_dict({
+        'i': 1, 'f': 2.0, 's': 'a', 'dt': datetime.datetime.now(), 'd': datetime.date.today(),
+        'nested': {'a': {'x': 1, 'y': 'a'}, 'b': [], 'c': {}},
+        'dcs': [], 'ints': ints, 'dates': [], 'by_key': {}, 'pair': (1, datetime.date.today()), 'any_len': ('a',),
+    })
+    assert dm.ints is ints
+    assert SimpleWithCollections.from_trusted_dict({'x': ints, 'y': {}}).x is ints
+    with pytest.raises(KeyError):
+        Simple.from_trusted_dict({'x': 1})
+
+
+def test_generated_source_is_registered_to_linecache():
+    import linecache
+    import traceback
+
+    def define():
+        @datamodels.datamodel
+        class WithLines:
+            x: int
+            y: typing.List[int]
+        return WithLines
+
+    WithLines = define()
+    code = WithLines.from_dict.__code__
+    assert code.co_filename.startswith('<datamodels datamodels.test_datamodel.')
+    assert code.co_filename.endswith('.WithLines.from_dict>')
+    assert ''.join(linecache.getlines(code.co_filename)) == WithLines.from_dict.__datamodel_source__
+    assert WithLines.from_dict.__qualname__.endswith('WithLines.from_dict')
+    assert WithLines.to_serializeable.__qualname__.endswith('WithLines.to_serializeable')
+    nested_names = [c.co_name for c in code.co_consts if hasattr(c, 'co_name')]
+    # code objects can be renamed only on python 3.8+
+    assert nested_names == ['y.<genexpr>' if hasattr(code, 'replace') else '<genexpr>']
+
+    with pytest.raises(TypeError) as e:
+        WithLines.from_dict({'x': 1, 'y': 2})
+    assert 'y=list(int(iv) for iv in d["y"])' in ''.join(traceback.format_tb(e.tb))
+
+    # redefined model gets its own file
+    assert define().from_dict.__code__.co_filename != code.co_filename
@@ -0,0 +1,78 @@
+import sys
+import typing
+import datamodels
+from datamodels import memory_report
+
+
+@datamodels.datamodel
+class Leaf:
+    name: str
+    values: typing.List[float]
+
+
+@datamodels.datamodel
+class Root:
+    leaf: Leaf
+    leaves: typing.List[Leaf]
+    tags: typing.Dict[str, str]
+
+
+def test_memory_report_per_class_and_field():
+    leaf = Leaf('leaf name', [1.5, 2.5])
+    root = Root(leaf, [Leaf('other', [])], {'key': 'value'})
+    report = memory_report(root)
+    assert not report.sampled
+    assert set(report.classes) == {'Root', 'Leaf'}
+    assert report.classes['Root'].count == 1
+    assert report.classes['Leaf'].count == 2
+    root_fields = report.classes['Root'].fields
+    assert root_fields['leaf'] == 0  # reported under Leaf
+    assert root_fields['leaves'] == sys.getsizeof(root.leaves)
+    assert root_fields['tags'] == sum(map(sys.getsizeof, (root.tags, 'key', 'value')))
+    leaf_values = report.classes['Leaf'].fields['values']
+    assert leaf_values == sum(map(sys.getsizeof, (leaf.values, 1.5, 2.5, root.leaves[0].values)))
+    assert report.total_bytes == sum(c.bytes for c in report.classes.values())
+    assert 'Root' in report.format()
+
+
+def test_memory_report_counts_shared_objects_once():
+    values = [float(i) for i in range(100)]
+    leaves = [Leaf('shared', values) for _ in range(10)]
+    report = memory_report(leaves)
+    assert report.classes['Leaf'].count == 10
+    assert report.classes['Leaf'].fields['values'] == sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+
+
+def test_memory_report_samples_large_collections():
+    leaves = [Leaf(str(i), [float(i)]) for i in range(10000)]
+    report = memory_report(leaves, sample_size=100)
+    assert report.sampled
+    assert report.classes['Leaf'].count == 10000
+    exact = memory_report(leaves, sample_size=len(leaves))
+    assert not exact.sampled
+    assert abs(report.total_bytes - exact.total_bytes) / exact.total_bytes < 0.05
+    assert memory_report(iter(leaves[:10])).classes['Leaf'].count == 10
+
+
+def test_memory_report_does_not_scale_shared_objects_when_sampling():
+    values = [float(i) for i in range(100)]
+    leaves = [Leaf(str(i), values) for i in range(10000)]
+    report = memory_report(leaves, sample_size=100)
+    assert report.sampled
+    assert report.classes['Leaf'].fields['values'] == sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+    exact = memory_report(leaves, sample_size=len(leaves))
+    assert abs(report.total_bytes - exact.total_bytes) / exact.total_bytes < 0.05
+
+
+@datamodels.datamodel(frozen=True, cache_serialized=True)
+class CachedLeaf:
+    name: str
+
+
+def test_memory_report_counts_attributes_that_are_not_fields():
+    leaf = CachedLeaf('leaf name')
+    leaf.to_json()
+    serialized = leaf.to_serializeable()
+    fields = memory_report(leaf).classes['CachedLeaf'].fields
+    assert fields['_datamodel_serialized'] == sys.getsizeof(serialized) + sys.getsizeof('name')
+    assert fields['_datamodel_json'] == sys.getsizeof(leaf.to_json())
@@ -0,0 +1,85 @@
+import base64
+import json
+import pytest
+import datamodels
+
+numpy = pytest.importorskip('numpy')
+from datamodels.ndarray import ndarray_field  # noqa: E402: needs numpy
+
+
+@datamodels.datamodel(eq=False)
+class WithArrays:
+    plain: numpy.ndarray
+    listed: numpy.ndarray = ndarray_field(dtype='int32', shape=(-1, 2))
+    encoded: numpy.ndarray = ndarray_field(dtype='<f4', encoding='base64',
+                                           default_factory=lambda: numpy.zeros(0, dtype='<f4'))
+
+
+def test_ndarray_serialization_deserialization():
+    dm = WithArrays(
+        numpy.array([1.5, 2.5]),
+        numpy.array([[1, 2], [3, 4]], dtype='int32'),
+        numpy.array([0.5, 1.5], dtype='<f4'),
+    )
+    d = dm.to_serializeable()
+    assert d == {
+        'plain': [1.5, 2.5],
+        'listed': [[1, 2], [3, 4]],
+        'encoded': base64.b64encode(numpy.array([0.5, 1.5], dtype='<f4').tobytes()).decode('ascii'),
+    }
+    assert json.loads(dm.to_json()) == d
+    for dm2 in (WithArrays.from_dict(d), WithArrays.from_json(dm.to_json())):
+        assert numpy.array_equal(dm.plain, dm2.plain)
+        assert numpy.array_equal(dm.listed, dm2.listed)
+        assert dm2.listed.dtype == numpy.int32
+        assert numpy.array_equal(dm.encoded, dm2.encoded)
+        assert dm2.encoded.dtype == numpy.float32
+
+
+def test_ndarray_structuring_applies_dtype_and_shape():
+    dm = WithArrays.from_dict({'plain': [1, 2], 'listed': [1, 2, 3, 4]})
+    assert dm.plain.dtype == numpy.int64
+    assert dm.listed.shape == (2, 2)
+    assert dm.listed.dtype == numpy.int32
+    assert dm.encoded.shape == (0,)
+    with pytest.raises(ValueError):
+        WithArrays.from_dict({'plain': [], 'listed': [1, 2, 3]})
+
+
+def test_ndarray_structuring_from_buffers_does_not_copy():
+    arr = numpy.arange(4, dtype='int32')
+    buf = bytearray(arr.tobytes())
+    dm = WithArrays.from_dict({'plain': arr, 'listed': memoryview(buf), 'encoded': b'\x00\x00\x00\x00'})
+    assert dm.plain is arr
+    assert dm.listed.base is not None
+    buf[0] = 9
+    assert dm.listed[0, 0] == 9
+    assert list(dm.encoded) == [0.0]
+
+
+def test_ndarray_field_encodings():
+    @datamodels.datamodel(eq=False)
+    class WithBytes:
+        a: numpy.ndarray = ndarray_field(dtype='uint8', encoding='bytes')
+
+    dm = WithBytes(numpy.array([1, 2, 3], dtype='uint8'))
+    assert dm.to_serializeable() == {'a': b'\x01\x02\x03'}
+    assert list(WithBytes.from_dict(dm.to_serializeable()).a) == [1, 2, 3]
+
+    with pytest.raises(ValueError):
+        WithBytes(numpy.zeros((2, 3), dtype='uint8')).to_serializeable()
+
+    @datamodels.datamodel(eq=False)
+    class WithShapedBase64:
+        a: numpy.ndarray = ndarray_field(dtype='<i2', shape=(-1, 3), encoding='base64')
+
+    dm = WithShapedBase64(numpy.arange(6, dtype='<i2').reshape(2, 3))
+    dm2 = WithShapedBase64.from_json(dm.to_json())
+    assert dm2.a.shape == (2, 3)
+    assert numpy.array_equal(dm.a, dm2.a)
+    dm2.a[0, 0] = 9  # writable
+
+    with pytest.raises(ValueError):
+        ndarray_field(encoding='base64')
+    with pytest.raises(ValueError):
+        ndarray_field(dtype='int8', encoding='foo')
@@ -0,0 +1,52 @@
+import linecache
+import typing
+import datamodels
+from datamodels import field_timings
+from datamodels.timings import FieldTimings
+
+
+@datamodels.datamodel
+class Point:
+    x: float
+    y: float
+
+
+@datamodels.datamodel
+class Shape:
+    name: str
+    points: typing.List[Point]
+    area: float = datamodels.field(init=False, default=0.0)
+
+    def __post_init__(self):
+        self.area = float(len(self.points))
+
+
+def test_field_timings_per_field():
+    dicts = [{'name': f'shape {i}', 'points': [{'x': i, 'y': 1.5}] * 10} for i in range(100)]
+    timings = field_timings(Shape, iter(dicts), repeat=2)
+    assert timings.model == 'Shape'
+    assert timings.count == 200
+    assert set(timings.structuring) == {'name', 'points', '__init__'}
+    assert set(timings.unstructuring) == {'name', 'points', 'area'}
+    assert all(seconds > 0 for seconds in timings.structuring.values())
+    assert all(seconds > 0 for seconds in timings.unstructuring.values())
+    assert timings.structuring['points'] > timings.structuring['name']
+    assert 'points' in timings.format()
+    assert FieldTimings.from_json(timings.to_json()) == timings
+
+
+def test_timed_methods_match_the_generated_ones():
+    from datamodels.timings import _build_timed_from_dict, _build_timed_to_serializeable
+    d = {'name': 'shape', 'points': [{'x': 1, 'y': 1.5}]}
+    shape = _build_timed_from_dict(Shape)(Shape, d, {'name': 0.0, 'points': 0.0, '__init__': 0.0})
+    assert shape == Shape.from_dict(d)
+    assert _build_timed_to_serializeable(Shape)(shape, {'name': 0.0, 'points': 0.0, 'area': 0.0}) == \
+        shape.to_serializeable()
+
+
+def test_field_timings_generates_the_timed_methods_once():
+    field_timings(Point, [{'x': 1, 'y': 2}])
+    n_cached = len(linecache.cache)
+    for _ in range(10):
+        field_timings(Point, [{'x': 1, 'y': 2}])
+    assert len(linecache.cache) == n_cached
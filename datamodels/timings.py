@@ -0,0 +1,112 @@
+'''
+Per field timings of the generated `from_dict` and `to_serializeable`.
+
+`field_timings` generates instrumented copies of the methods, where each field expression is assigned to a local and
+followed by a `perf_counter` call, and runs those over the given dicts. The field expressions are the same as in the
+plain methods without inlining, so nested datamodels are timed as part of their parent field. `__init__` is the time of
+the `cls(...)` call, including `__post_init__`. The timer calls add some overhead to each field, so compare the
+fields with each other rather than the total with the plain methods.
+'''
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Type, TypeVar
+
+from datamodels import (
+    datamodel, fields, is_datamodel, _create_fn, _gen_dict_items, _gen_init_kwargs, _registry_lock,
+    _structure_dataclass, _structure_union, _structure_value, _to_serializeable,
+)
+
+T = TypeVar('T')
+
+_init_key = '__init__'
+_timed_methods_attr = '__datamodel_timed_methods__'
+
+
+@datamodel
+class FieldTimings:
+    model: str
+    count: int
+    # field name -> seconds in total over all the calls, of from_dict and to_serializeable
+    # (the fields can't have the names of the generated methods)
+    structuring: Dict[str, float]
+    unstructuring: Dict[str, float]
+
+    def format(self) -> str:
+        lines = [f'{self.model}, {self.count:,} calls']
+        for method, timings in (('from_dict', self.structuring), ('to_serializeable', self.unstructuring)):
+            total = sum(timings.values()) or 1.0
+            lines.append(f'{method:<40}{"total s":>12}{"us/call":>10}{"%":>7}')
+            for name, seconds in sorted(timings.items(), key=lambda kv: -kv[1]):
+                lines.append(f'  {name:<38}{seconds:>12.4f}{seconds / max(self.count, 1) * 1e6:>10.2f}'
+                             f'{seconds / total * 100:>7.1f}')
+        return '\n'.join(lines)
+
+
+def _build_timed_from_dict(cls: Type[T]) -> Callable[[Type[T], Dict[str, Any], Dict[str, float]], T]:
+    globs = {
+        'cls': cls,
+        '_perf_counter': perf_counter,
+        '_structure_dataclass': _structure_dataclass,
+        '_structure_value': _structure_value,
+        '_structure_union': _structure_union,
+    }
+    body_lines = ['t = _perf_counter()']
+    field_lines = {}
+    field_names = []
+    for kwarg_expr in _gen_init_kwargs(cls, globs, 'd'):
+        name, value_expr = kwarg_expr.split('=', 1)
+        field_lines[len(body_lines)] = name
+        field_names.append(name)
+        body_lines += [f'v_{name} = {value_expr}',
+                       f'now = _perf_counter(); timings["{name}"] += now - t; t = now']
+    kwargs = ', '.join(f'{name}=v_{name}' for name in field_names)
+    body_lines += [f'obj = cls({kwargs})',
+                   f'timings["{_init_key}"] += _perf_counter() - t',
+                   'return obj']
+    return _create_fn('from_dict_timed', ['cls', 'd', 'timings'], body_lines,
+                      globals=globs, cls=cls, field_lines=field_lines)
+
+
+def _build_timed_to_serializeable(cls: Type[T]) -> Callable[[T, Dict[str, float]], Dict[str, Any]]:
+    globs = {
+        '_perf_counter': perf_counter,
+        '_to_serializeable': _to_serializeable,
+    }
+    body_lines = ['d = {}',
+                  't = _perf_counter()']
+    field_lines = {}
+    for f, item_expr in zip(fields(cls), _gen_dict_items(cls, globs, 'self')):
+        value_expr = item_expr[len(f'"{f.name}": '):]
+        field_lines[len(body_lines)] = f.name
+        body_lines += [f'd["{f.name}"] = {value_expr}',
+                       f'now = _perf_counter(); timings["{f.name}"] += now - t; t = now']
+    body_lines.append('return d')
+    return _create_fn('to_serializeable_timed', ['self', 'timings'], body_lines,
+                      globals=globs, cls=cls, field_lines=field_lines)
+
+
+def _timed_methods(cls: Type[T]):
+    # generated once per class, so the linecache entries of those are not piling up
+    with _registry_lock:
+        if _timed_methods_attr not in cls.__dict__:
+            setattr(cls, _timed_methods_attr, (_build_timed_from_dict(cls), _build_timed_to_serializeable(cls)))
+        return cls.__dict__[_timed_methods_attr]
+
+
+def field_timings(cls: Type[T], dicts: Iterable[Dict[str, Any]], repeat: int = 1) -> FieldTimings:
+    '''
+    Times structuring the dicts to instances of datamodel cls and unstructuring those back, per field.
+    Runs over the dicts repeat times.
+    '''
+    if not is_datamodel(cls):
+        raise ValueError(f'field_timings requires datamodel class, got: {cls}')
+    dicts = list(dicts)
+    from_dict_timed, to_serializeable_timed = _timed_methods(cls)
+
+    from_dict_timings = {f.name: 0.0 for f in fields(cls) if f.init}
+    from_dict_timings[_init_key] = 0.0
+    to_serializeable_timings = {f.name: 0.0 for f in fields(cls)}
+    for _ in range(repeat):
+        objs = [from_dict_timed(cls, d, from_dict_timings) for d in dicts]
+        for obj in objs:
+            to_serializeable_timed(obj, to_serializeable_timings)
+    return FieldTimings(cls.__qualname__, len(dicts) * repeat, from_dict_timings, to_serializeable_timings)
@@ -47,6 +47,14 @@ def type_to_str(type_or_class: typing.Any) -> str:
     raise ValueError(f'Could not parse type representation for {type_or_class} of type: {type(type_or_class)}')
 
 
+def escape_braces(s: str) -> str:
+    '''
+    Related to code construction
+    escapes literal braces of an expression so that it can be part of an other expression that is called with .format
+    '''
+    return s.replace('{', '{{').replace('}', '}}')
+
+
 class MyValTemplate(Template):
     '''
     Related to code construction
@@ -14,6 +14,7 @@ setup(name='datamodels',
       license='MIT',
       packages=['datamodels'],
       install_requires=["dataclasses;python_version=='3.7'"],
+      extras_require={"numpy": ["numpy"]},
       python_requires=">=3.7",
       keywords="dataclasses json",
       setup_requires=["pytest-runner"],